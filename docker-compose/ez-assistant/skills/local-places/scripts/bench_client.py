@@ -0,0 +1,93 @@
+"""Compare a new httpx.Client per call with the shared pooled AsyncClient.
+
+Start the stand-in first (see ``scripts/standin.py``), then run:
+
+    uv run python scripts/bench_client.py --base-url http://127.0.0.1:8100/v1 -n 2000 -c 32
+
+``per-call`` is what ``_request`` used to do: open a sync ``httpx.Client`` for
+each call on a worker thread and close it afterwards, so every call pays
+connection setup. ``pooled`` sends the same calls through the client from
+``google_places._create_client`` and reuses its keep-alive connections. Both
+modes fetch place details, so only the client strategy differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from typing import Any
+
+import httpx
+
+from local_places.google_places import _create_client
+
+_FIELD_MASK = "id,displayName"
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def _per_call(url: str) -> None:
+    with httpx.Client(timeout=10.0) as client:
+        client.get(url, headers={"X-Goog-FieldMask": _FIELD_MASK}).raise_for_status()
+
+
+async def _run(mode: str, args: argparse.Namespace) -> dict[str, Any]:
+    latencies: list[float] = []
+    gate = asyncio.Semaphore(args.concurrency)
+    pooled = _create_client() if mode == "pooled" else None
+
+    async def call(index: int) -> None:
+        url = f"{args.base_url}/places/bench-{index % 50}"
+        async with gate:
+            started = time.perf_counter()
+            if pooled is None:
+                await asyncio.to_thread(_per_call, url)
+            else:
+                response = await pooled.get(url, headers={"X-Goog-FieldMask": _FIELD_MASK})
+                response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(call(index) for index in range(args.requests)))
+    finally:
+        if pooled is not None:
+            await pooled.aclose()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": len(ordered) / elapsed,
+        **{f"p{pct}_ms": _percentile(ordered, pct) * 1000 for pct in (50, 90, 99)},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8100/v1")
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = {mode: asyncio.run(_run(mode, args)) for mode in ("per-call", "pooled")}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'client':<10} {'reqs':>6} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for mode, row in report.items():
+        print(
+            f"{mode:<10} {row['requests']:>6} {row['rps']:>8.1f} {row['p50_ms']:>8.2f}"
+            f" {row['p90_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+    print("latencies in ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark upstream parsing and response encoding on a recorded-style page.
+
+    uv run python scripts/bench_parse.py
+    uv run python scripts/bench_parse.py --payload recording.jsonl --json
+
+``parse`` compares two ways of turning a searchText body into ``PlaceDetails``.
+The first is the path used before ``local_places.wire``: ``json.loads``, then
+walking the dicts. The second is the current path: ``model_validate_json`` into
+the wire models, then the attribute-based parser.
+
+``encode`` compares two ways of sending a ``SearchResponse``. The first is
+FastAPI's ``serialize_response`` pass (``response_model`` validation plus
+encoding). The second is the ``LOCAL_PLACES_FAST_RESPONSES`` path, a single
+``model_dump_json``.
+
+The default payload is ``scripts/fixtures/search_text_page.json``: 20 places
+with the fields and noise of a real searchText page. ``--payload`` takes a JSON
+body, or a recording (``GOOGLE_PLACES_RECORD_PATH``), in which case its largest
+successful searchText response is used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+os.environ.setdefault("GOOGLE_PLACES_API_KEY", "bench")
+
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+from local_places.google_places import _ENUM_TO_PRICE_LEVEL, _parse_place_details  # noqa: E402
+from local_places.main import app  # noqa: E402
+from local_places.schemas import LatLng, PlaceDetails, SearchResponse  # noqa: E402
+from local_places.wire import WireSearchResponse  # noqa: E402
+
+_FIXTURE = Path(__file__).with_name("fixtures") / "search_text_page.json"
+
+
+def _load_payload(path: str | None) -> bytes:
+    if path is None:
+        return _FIXTURE.read_bytes()
+    raw = Path(path).read_bytes()
+    if not path.endswith(".jsonl"):
+        return raw
+    bodies = [
+        json.dumps(record["response"]).encode()
+        for record in map(json.loads, filter(str.strip, raw.decode().splitlines()))
+        if record["path"].endswith(":searchText") and record["status"] < 400
+    ]
+    if not bodies:
+        raise SystemExit(f"No successful searchText response in {path}.")
+    return max(bodies, key=len)
+
+
+def _dict_details(place: dict[str, Any]) -> PlaceDetails:
+    """The dict-walking parser that ``local_places.wire`` replaced."""
+    location = place.get("location") or {}
+    regular = place.get("regularOpeningHours") or {}
+    current = place.get("currentOpeningHours") or {}
+    latitude, longitude = location.get("latitude"), location.get("longitude")
+    return PlaceDetails(
+        place_id=place.get("id", ""),
+        name=(place.get("displayName") or {}).get("text"),
+        address=place.get("formattedAddress"),
+        location=(
+            None
+            if latitude is None or longitude is None
+            else LatLng(lat=latitude, lng=longitude)
+        ),
+        rating=place.get("rating"),
+        price_level=_ENUM_TO_PRICE_LEVEL.get(place.get("priceLevel") or ""),
+        types=place.get("types"),
+        phone=place.get("nationalPhoneNumber"),
+        website=place.get("websiteUri"),
+        hours=regular.get("weekdayDescriptions"),
+        open_now=current.get("openNow"),
+    )
+
+
+def _parse_dicts(body: bytes) -> list[PlaceDetails]:
+    return [_dict_details(place) for place in json.loads(body).get("places", [])]
+
+
+def _parse_wire(body: bytes) -> list[PlaceDetails]:
+    places = WireSearchResponse.model_validate_json(body).places
+    return [_parse_place_details(place, "") for place in places]
+
+
+def _search_response_field() -> Any:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == "/places/search":
+            return route.response_field
+    raise RuntimeError("POST /places/search is not registered.")
+
+
+def _time(func: Callable[[], Any], number: int, repeat: int) -> dict[str, float]:
+    runs = [run / number * 1e6 for run in timeit.repeat(func, number=number, repeat=repeat)]
+    return {"best_us": min(runs), "median_us": statistics.median(runs)}
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    body = _load_payload(args.payload)
+    assert _parse_dicts(body) == _parse_wire(body), "parsers disagree on this payload"
+
+    response = SearchResponse(results=_parse_wire(body))
+    field = _search_response_field()
+
+    def fastapi_encode() -> bytes:
+        # What the route does with a response_model (validate, then dump_json).
+        # serialize_response never awaits here, so drive it without an event loop.
+        coroutine = serialize_response(field=field, response_content=response, dump_json=True)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("serialize_response unexpectedly awaited.")
+
+    return {
+        "payload_bytes": len(body),
+        "places": len(response.results),
+        "parse": {
+            "dicts": _time(lambda: _parse_dicts(body), args.number, args.repeat),
+            "wire": _time(lambda: _parse_wire(body), args.number, args.repeat),
+        },
+        "encode": {
+            "fastapi": _time(fastapi_encode, args.number, args.repeat),
+            "model_dump_json": _time(response.model_dump_json, args.number, args.repeat),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--payload", help="JSON body or recording JSONL (default: bundled fixture)"
+    )
+    parser.add_argument("-n", "--number", type=int, default=200, help="calls per timing run")
+    parser.add_argument("-r", "--repeat", type=int, default=15, help="timing runs per case")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"payload: {report['payload_bytes']} bytes, {report['places']} places")
+    print(f"{'case':<24} {'best':>10} {'median':>10}")
+    for section in ("parse", "encode"):
+        for case, row in report[section].items():
+            print(f"{section + ' ' + case:<24} {row['best_us']:>10.1f} {row['median_us']:>10.1f}")
+    print("microseconds per page")
+
+
+if __name__ == "__main__":
+    main()
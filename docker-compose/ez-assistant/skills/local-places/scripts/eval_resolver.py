@@ -0,0 +1,86 @@
+"""Measure local resolver accuracy on resolve calls from a recording.
+
+Record real traffic first by running the server with
+``GOOGLE_PLACES_RECORD_PATH=recording.jsonl``, then run:
+
+    uv run python scripts/eval_resolver.py recording.jsonl --min-score 0.85
+
+Each recorded query is looked up against all the others (leave-one-out). A
+local answer is correct when its top place matches the one upstream returned
+for that query, so the report shows how often the fuzzy path would have
+answered a query and how often that answer would have been wrong.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any
+
+from local_places.google_places import _RESOLVE_FIELD_MASK
+from local_places.resolver import LocalResolver, normalize
+from local_places.schemas import LocationResolveResponse, ResolvedLocation
+
+
+def _load(path: str) -> dict[str, tuple[str, int, LocationResolveResponse]]:
+    """Resolve calls by normalized query text; the last recording of a query wins."""
+    queries: dict[str, tuple[str, int, LocationResolveResponse]] = {}
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["field_mask"] != _RESOLVE_FIELD_MASK or record["status"] >= 400:
+                continue
+            places = (record["response"] or {}).get("places") or []
+            if not places:
+                continue
+            text = record["body"]["textQuery"]
+            response = LocationResolveResponse(
+                results=[ResolvedLocation(place_id=place.get("id") or "") for place in places]
+            )
+            queries[normalize(text)] = (text, record["body"].get("pageSize", 1), response)
+    return queries
+
+
+def evaluate(
+    queries: dict[str, tuple[str, int, LocationResolveResponse]], min_score: float
+) -> dict[str, Any]:
+    resolver = LocalResolver(threshold=min_score, max_entries=len(queries) + 1, aliases={})
+    for text, limit, response in queries.values():
+        resolver.learn(text, limit, response)
+
+    wrong: list[dict[str, Any]] = []
+    correct = 0
+    for text, limit, response in queries.values():
+        resolver.forget(text)
+        found = resolver.lookup(text, 1)
+        if found is not None:
+            answer, score = found
+            if answer.results[0].place_id == response.results[0].place_id:
+                correct += 1
+            else:
+                wrong.append({"query": text, "score": round(score, 3)})
+        resolver.learn(text, limit, response)
+
+    answered = correct + len(wrong)
+    return {
+        "queries": len(queries),
+        "answered_locally": answered,
+        "correct": correct,
+        "wrong": len(wrong),
+        "precision": correct / answered if answered else None,
+        "wrong_queries": wrong,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="JSONL file written via GOOGLE_PLACES_RECORD_PATH")
+    parser.add_argument("--min-score", type=float, default=0.85)
+    args = parser.parse_args(argv)
+    print(json.dumps(evaluate(_load(args.recording), args.min_score), indent=2))
+
+
+if __name__ == "__main__":
+    main()
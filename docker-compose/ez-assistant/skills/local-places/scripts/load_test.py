@@ -0,0 +1,212 @@
+"""Drive a running Local Places server and report RPS and latency per endpoint.
+
+Point the server at the stand-in first (see ``scripts/standin.py``) so no
+quota is spent, then run for example:
+
+    uv run python scripts/load_test.py --base-url http://127.0.0.1:8000 -c 64 -d 30
+
+Requests come from ``--requests`` (JSONL lines of ``{"method", "path", "json"}``)
+or, by default, a built-in mix of search, details, nearby and resolve calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+_QUERIES = ["coffee", "pizza", "bakery", "ramen", "bookstore", "pharmacy", "park", "museum"]
+_LOCATIONS = ["New York", "Brooklyn", "Jersey City", "Hoboken", "Queens"]
+_CENTER = (40.7580, -73.9855)
+
+
+@dataclass
+class _Spec:
+    method: str
+    path: str
+    json: dict[str, Any] | None = None
+
+
+@dataclass
+class _Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+def _route(spec: _Spec) -> str:
+    if spec.path.startswith("/places/") and ":" not in spec.path and spec.method == "GET":
+        return "GET /places/{place_id}"
+    return f"{spec.method} {spec.path}"
+
+
+def _load_specs(path: str) -> list[_Spec]:
+    with open(path, encoding="utf-8") as handle:
+        return [
+            _Spec(item["method"].upper(), item["path"], item.get("json"))
+            for item in map(json.loads, filter(str.strip, handle))
+        ]
+
+
+class _DefaultMix:
+    """Built-in traffic mix; details IDs are harvested from search responses."""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self.place_ids: list[str] = []
+
+    def next(self) -> _Spec:
+        rng = self._rng
+        roll = rng.random()
+        if roll < 0.3 and self.place_ids:
+            return _Spec("GET", f"/places/{rng.choice(self.place_ids)}")
+        if roll < 0.6:
+            return _Spec("POST", "/places/search", {"query": rng.choice(_QUERIES), "limit": 10})
+        if roll < 0.8:
+            lat, lng = _CENTER
+            return _Spec(
+                "POST",
+                "/places/nearby",
+                {
+                    "lat": lat + rng.uniform(-0.02, 0.02),
+                    "lng": lng + rng.uniform(-0.02, 0.02),
+                    "radius_m": 800,
+                },
+            )
+        return _Spec(
+            "POST",
+            "/locations/resolve",
+            {"location_text": rng.choice(_LOCATIONS), "limit": 5},
+        )
+
+    def observe(self, spec: _Spec, response: httpx.Response) -> None:
+        if spec.path != "/places/search" or response.status_code != 200:
+            return
+        if len(self.place_ids) > 500:
+            return
+        for result in response.json().get("results", []):
+            if result.get("place_id"):
+                self.place_ids.append(result["place_id"])
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    deadline: float,
+    results: _Results,
+    next_spec: Any,
+    observe: Any,
+) -> None:
+    while time.perf_counter() < deadline:
+        spec = next_spec()
+        route = _route(spec)
+        started = time.perf_counter()
+        try:
+            response = await client.request(spec.method, spec.path, json=spec.json)
+        except httpx.HTTPError:
+            results.errors[route] += 1
+            continue
+        results.latencies[route].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            results.errors[route] += 1
+        elif observe is not None:
+            observe(spec, response)
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": len(ordered) / elapsed if elapsed else 0.0,
+        **{f"p{pct}_ms": _percentile(ordered, pct) * 1000 for pct in (50, 90, 99)},
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, Any]]:
+    rng = random.Random(args.seed)
+    if args.requests:
+        specs = _load_specs(args.requests)
+        next_spec, observe = (lambda: rng.choice(specs)), None
+    else:
+        mix = _DefaultMix(rng)
+        next_spec, observe = mix.next, mix.observe
+
+    results = _Results()
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                _worker(client, deadline, results, next_spec, observe)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    report = {
+        route: _summary(latencies, results.errors[route], elapsed)
+        for route, latencies in sorted(results.latencies.items())
+    }
+    report["total"] = _summary(
+        [latency for latencies in results.latencies.values() for latency in latencies],
+        sum(results.errors.values()),
+        elapsed,
+    )
+    return report
+
+
+def _print_table(report: dict[str, dict[str, Any]]) -> None:
+    header = (
+        f"{'endpoint':<32} {'reqs':>8} {'errs':>6} {'rps':>9}"
+        f" {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for route, row in report.items():
+        print(
+            f"{route:<32} {row['requests']:>8} {row['errors']:>6} {row['rps']:>9.1f}"
+            f" {row['p50_ms']:>8.2f} {row['p90_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+            f" {row['max_ms']:>8.2f}"
+        )
+    print("latencies in ms")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--requests", help="JSONL file of request specs to replay")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Local stand-in for the Google Places API that replays recorded calls.
+
+Record real traffic first by running the server with
+``GOOGLE_PLACES_RECORD_PATH=recording.jsonl``, then serve it back:
+
+    uv run python scripts/standin.py recording.jsonl --port 8100 --latency-ms 80 --jitter-ms 40
+
+and start the API with ``GOOGLE_PLACES_BASE_URL=http://127.0.0.1:8100/v1``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from collections import defaultdict
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from local_places.recorder import record_key
+
+
+def _endpoint(method: str, path: str) -> str:
+    last_segment = path.rsplit("/", 1)[-1]
+    if ":" in last_segment:
+        return f"{method} {last_segment.split(':', 1)[1]}"
+    return f"{method} details"
+
+
+def _load(path: str) -> tuple[dict[str, dict[str, Any]], dict[str, list[dict[str, Any]]]]:
+    exact: dict[str, dict[str, Any]] = {}
+    by_endpoint: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            exact[record["key"]] = record
+            if record["status"] < 400:
+                by_endpoint[_endpoint(record["method"], record["path"])].append(record)
+    return exact, by_endpoint
+
+
+def _error(status_code: int) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"code": status_code, "message": "Injected by stand-in.", "status": "INJECTED"}},
+        status_code=status_code,
+    )
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    exact, by_endpoint = _load(args.recording)
+    rng = random.Random(args.seed)
+    app = FastAPI(title="Places stand-in")
+    app.state.served = defaultdict(int)
+
+    @app.get("/_standin/stats")
+    async def stats() -> dict[str, Any]:
+        return {"recorded": len(exact), "served": dict(app.state.served)}
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def replay(path: str, request: Request) -> JSONResponse:
+        delay = args.latency_ms + rng.uniform(-args.jitter_ms, args.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if rng.random() < args.error_rate:
+            app.state.served["injected"] += 1
+            return _error(rng.choice(args.error_status))
+
+        raw = await request.body()
+        body = json.loads(raw) if raw else None
+        field_mask = request.headers.get("X-Goog-FieldMask", "")
+        url_path = request.url.path
+        record = exact.get(record_key(request.method, url_path, body, field_mask))
+        if record is not None:
+            app.state.served["exact"] += 1
+        elif not args.strict and by_endpoint.get(_endpoint(request.method, url_path)):
+            # Unrecorded queries get a recorded answer from the same endpoint.
+            record = rng.choice(by_endpoint[_endpoint(request.method, url_path)])
+            app.state.served["fallback"] += 1
+        else:
+            app.state.served["missing"] += 1
+            return _error(404)
+        return JSONResponse(record["response"], status_code=record["status"])
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="JSONL file written via GOOGLE_PLACES_RECORD_PATH")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failed")
+    parser.add_argument(
+        "--error-status",
+        type=lambda value: [int(code) for code in value.split(",")],
+        default=[503],
+        help="comma-separated status codes to inject (default 503)",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="404 unrecorded calls instead of reusing others"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
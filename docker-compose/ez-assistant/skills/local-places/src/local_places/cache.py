@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger("local_places.cache")
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def payload_etag(payload: bytes) -> str:
+    """Weak ETag for an encoded response body.
+
+    Weak because the compression middleware may send the same body gzip- or
+    br-encoded, and a strong validator would have to differ per content-coding.
+    """
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+@dataclass
+class CacheEntry(Generic[ModelT]):
+    value: ModelT
+    payload: bytes
+    expires_at: float
+    refresh_at: float
+    hits: int = 0
+    _etag: str | None = field(default=None, repr=False)
+
+    @classmethod
+    def uncached(cls, value: ModelT) -> CacheEntry[ModelT]:
+        """Wrap a value that is not (or no longer) held by a cache."""
+        payload = value.model_dump_json().encode()
+        return cls(value=value, payload=payload, expires_at=0, refresh_at=0)
+
+    @property
+    def etag(self) -> str:
+        # Computed on first use and kept with the entry, so cache hits only hash once.
+        if self._etag is None:
+            self._etag = payload_etag(self.payload)
+        return self._etag
+
+
+class _SQLiteTier:
+    """Write-behind on-disk tier shared by every cache pointing at one file.
+
+    Writes are queued and committed in batches by a writer thread with its
+    own connection, so callers on the event loop never wait for a commit.
+    Reads see queued writes first. SQLite errors are logged and treated as
+    misses or dropped writes: the disk tier never fails a request.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.write_errors = 0
+        self._conn = self._connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+        self._writer_conn = self._connect(path)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Latest queued write per key (None deletes it), then whole-namespace
+        # clears and prunes, which are applied before the keyed writes.
+        self._pending: dict[tuple[str, str], tuple[bytes, float] | None] = {}
+        self._cleared: set[str] = set()
+        self._prunes: dict[str, float] = {}
+        self._wake = threading.Event()
+        self._writer = threading.Thread(
+            target=self._run, name="local-places-cache-writer", daemon=True
+        )
+        self._writer.start()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the file consistent at NORMAL; a crash only loses the last batches.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, namespace: str, key: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            if (namespace, key) in self._pending:
+                return self._pending[(namespace, key)]
+            if namespace in self._cleared:
+                return None
+        try:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Cache disk tier read failed: %s", exc)
+            return None
+        if row is None:
+            return None
+        return bytes(row[0]), row[1]
+
+    def set(self, namespace: str, key: str, payload: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._pending[(namespace, key)] = (payload, expires_at)
+        self._wake.set()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._pending[(namespace, key)] = None
+        self._wake.set()
+
+    def prune(self, namespace: str, expired_before: float) -> None:
+        with self._lock:
+            self._prunes[namespace] = max(self._prunes.get(namespace, 0.0), expired_before)
+        self._wake.set()
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            for pending_key in [k for k in self._pending if k[0] == namespace]:
+                del self._pending[pending_key]
+            self._prunes.pop(namespace, None)
+            self._cleared.add(namespace)
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Commit every queued write in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                cleared, self._cleared = self._cleared, set()
+                prunes, self._prunes = self._prunes, {}
+            if not (pending or cleared or prunes):
+                return
+            try:
+                with self._writer_conn:
+                    self._writer_conn.executemany(
+                        "DELETE FROM cache_entries WHERE namespace = ?",
+                        [(namespace,) for namespace in cleared],
+                    )
+                    self._writer_conn.executemany(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                        list(prunes.items()),
+                    )
+                    self._writer_conn.executemany(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        [key for key, row in pending.items() if row is None],
+                    )
+                    self._writer_conn.executemany(
+                        "INSERT OR REPLACE INTO cache_entries"
+                        " (namespace, key, payload, expires_at) VALUES (?, ?, ?, ?)",
+                        [(*key, *row) for key, row in pending.items() if row is not None],
+                    )
+            except sqlite3.Error as exc:
+                self.write_errors += 1
+                logger.warning(
+                    "Cache disk tier write failed, dropped %d writes: %s", len(pending), exc
+                )
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            # Let writes arriving in the same burst join this batch.
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+_tiers: dict[str, _SQLiteTier] = {}
+
+
+def _sqlite_tier(path: str) -> _SQLiteTier:
+    tier = _tiers.get(path)
+    if tier is None:
+        tier = _tiers[path] = _SQLiteTier(path)
+    return tier
+
+
+def flush_disk_tiers() -> None:
+    """Commit queued disk-tier writes. Called from the app lifespan on shutdown."""
+    for tier in list(_tiers.values()):
+        tier.flush()
+
+
+atexit.register(flush_disk_tiers)
+
+
+class TTLCache(Generic[ModelT]):
+    """Bounded LRU cache of response models with per-entry TTL.
+
+    Entries are stored alongside their JSON encoding, which is what the byte
+    limit is measured against and what the optional SQLite tier persists.
+    Expired entries are kept for ``stale_ttl`` seconds so they can still be
+    served through ``get_stale`` while the upstream is unavailable.
+
+    With a ``soft_ttl``, entries older than that are still served as fresh
+    but reported by ``is_due`` so the caller can revalidate them in the
+    background; ``ttl`` stays the hard limit after which lookups miss.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: type[ModelT],
+        *,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        stale_ttl: float = 0.0,
+        soft_ttl: float | None = None,
+        db_path: str | None = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._model = model
+        self._db_path = db_path
+        self._pruned = False
+        self._entries: OrderedDict[str, CacheEntry[ModelT]] = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _disk(self) -> _SQLiteTier | None:
+        if not self._db_path:
+            return None
+        try:
+            disk = _sqlite_tier(self._db_path)
+        except sqlite3.Error as exc:
+            logger.warning("Disabling %s cache disk tier at %s: %s", self.name, self._db_path, exc)
+            self._db_path = None
+            return None
+        if not self._pruned:
+            disk.prune(self.name, time.time() - self.stale_ttl)
+            self._pruned = True
+        return disk
+
+    def get(self, key: str) -> ModelT | None:
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, key: str) -> CacheEntry[ModelT] | None:
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                entry.hits += 1
+                return entry
+            if entry.expires_at + self.stale_ttl <= now:
+                self._remove(key)
+        else:
+            entry = self._load(key, now)
+            if entry is not None:
+                self._insert(key, entry)
+                if entry.expires_at > now:
+                    self.hits += 1
+                    entry.hits += 1
+                    return entry
+        self.misses += 1
+        return None
+
+    def peek(self, key: str) -> CacheEntry[ModelT] | None:
+        """Return the in-memory entry for ``key`` without touching stats or LRU order."""
+        return self._entries.get(key)
+
+    def get_stale(self, key: str) -> ModelT | None:
+        """Return an entry even if expired, as long as it is within ``stale_ttl``."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        entry = self._entries.get(key) or self._load(key, now)
+        if entry is None or entry.expires_at + self.stale_ttl <= now:
+            return None
+        self.stale_hits += 1
+        return entry.value
+
+    def is_due(self, entry: CacheEntry[ModelT]) -> bool:
+        """Whether a fresh entry is past its soft TTL and should be revalidated."""
+        return entry.refresh_at <= time.time()
+
+    def hottest(self, limit: int, due_before: float) -> list[str]:
+        """Keys of the most-hit entries whose soft TTL ends before ``due_before``."""
+        now = time.time()
+        due = [
+            (entry.hits, key)
+            for key, entry in self._entries.items()
+            if entry.hits
+            and entry.refresh_at <= due_before
+            and entry.expires_at + self.stale_ttl > now
+        ]
+        due.sort(reverse=True)
+        return [key for _, key in due[:limit]]
+
+    def decay_hits(self) -> None:
+        """Halve every hit count so hotness tracks recent traffic."""
+        for entry in self._entries.values():
+            entry.hits //= 2
+
+    def set(self, key: str, value: ModelT, ttl: float | None = None) -> None:
+        if not self.enabled:
+            return
+        payload = value.model_dump_json().encode()
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        entry = CacheEntry(
+            value=value,
+            payload=payload,
+            expires_at=now + ttl,
+            refresh_at=now + min(ttl, self.soft_ttl if self.soft_ttl is not None else ttl),
+        )
+        self._insert(key, entry)
+        disk = self._disk()
+        if disk is not None:
+            disk.set(self.name, key, payload, entry.expires_at)
+
+    def delete(self, key: str) -> None:
+        self._remove(key)
+        disk = self._disk()
+        if disk is not None:
+            disk.delete(self.name, key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+        disk = self._disk()
+        if disk is not None:
+            disk.clear(self.name)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+    def _load(self, key: str, now: float) -> CacheEntry[ModelT] | None:
+        disk = self._disk()
+        if disk is None:
+            return None
+        row = disk.get(self.name, key)
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at + self.stale_ttl <= now:
+            return None
+        try:
+            value = self._model.model_validate_json(payload)
+        except ValidationError:
+            logger.warning("Dropping unreadable %s cache entry %s.", self.name, key)
+            disk.delete(self.name, key)
+            return None
+        # The disk tier only stores the hard expiry; derive the soft one from it.
+        refresh_at = expires_at
+        if self.soft_ttl is not None:
+            refresh_at -= max(self.ttl - self.soft_ttl, 0.0)
+        return CacheEntry(
+            value=value, payload=payload, expires_at=expires_at, refresh_at=refresh_at
+        )
+
+    def _insert(self, key: str, entry: CacheEntry[ModelT]) -> None:
+        self._remove(key)
+        self._entries[key] = entry
+        self.size_bytes += len(entry.payload)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted.payload)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry.payload)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+
+from local_places.schemas import PlaceDetails, PlaceSummary
+
+logger = logging.getLogger("local_places.geo_index")
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_EARTH_RADIUS_M = 6_371_000.0
+_METERS_PER_DEGREE = 111_320.0
+_INDEX_PRECISION = 9
+
+
+def geohash_encode(lat: float, lng: float, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def _cell_size_deg(precision: int) -> tuple[float, float]:
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def covering_cells(lat: float, lng: float, radius_m: float) -> list[str]:
+    """Geohash cells covering the circle's bounding box.
+
+    The precision is the finest one whose cells are at least ``radius_m`` on
+    each side, so a circle never needs more than a 3x3 block of cells.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    precision = 2
+    for candidate in range(7, 2, -1):
+        cell_lat, cell_lng = _cell_size_deg(candidate)
+        if min(cell_lat * _METERS_PER_DEGREE, cell_lng * _METERS_PER_DEGREE * cos_lat) >= radius_m:
+            precision = candidate
+            break
+    cell_lat, cell_lng = _cell_size_deg(precision)
+    d_lat = radius_m / _METERS_PER_DEGREE
+    d_lng = radius_m / (_METERS_PER_DEGREE * cos_lat)
+    south, north = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+    west, east = lng - d_lng, lng + d_lng
+
+    cells: set[str] = set()
+    y = south
+    while True:
+        x = west
+        while True:
+            wrapped = (x + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(min(y, 89.999999), wrapped, precision))
+            if x >= east:
+                break
+            x = min(x + cell_lng, east)
+        if y >= north:
+            break
+        y = min(y + cell_lat, north)
+    return sorted(cells)
+
+
+class PlaceIndex:
+    """SQLite store of every place seen upstream, indexed by geohash.
+
+    ``coverage`` remembers circles known to be complete for a place type
+    (every place in them was returned upstream) and when they were fetched,
+    so nearby lookups know whether local data is fresh.
+
+    With a file path, writes are queued and committed in batches by a writer
+    thread with its own connection, like the cache's disk tier, so requests
+    never wait for a commit. Each batch is one transaction in call order, so
+    a covered circle never becomes visible before the places fetched with
+    it. An in-memory index has no disk to wait for and writes directly.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5):
+        self.flush_interval = flush_interval
+        self.write_errors = 0
+        self._conn = self._connect(path)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS places ("
+            " place_id TEXT PRIMARY KEY,"
+            " lat REAL NOT NULL,"
+            " lng REAL NOT NULL,"
+            " geohash TEXT NOT NULL,"
+            " rating REAL,"
+            " types TEXT,"
+            " payload TEXT NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS places_geohash ON places (geohash);"
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            " lat REAL NOT NULL,"
+            " lng REAL NOT NULL,"
+            " radius_m REAL NOT NULL,"
+            " place_type TEXT NOT NULL,"
+            " refreshed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS coverage_by_type ON coverage (place_type, refreshed_at);"
+        )
+        self._conn.commit()
+        self._pending: list[tuple[str, list[tuple[object, ...]]]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer_conn: sqlite3.Connection | None = None
+        if path != ":memory:":
+            self._writer_conn = self._connect(path)
+            threading.Thread(
+                target=self._run, name="local-places-geo-writer", daemon=True
+            ).start()
+            atexit.register(self.flush)
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, places: Iterable[PlaceSummary | PlaceDetails]) -> None:
+        now = time.time()
+        rows = [
+            (
+                place.place_id,
+                place.location.lat,
+                place.location.lng,
+                geohash_encode(place.location.lat, place.location.lng, _INDEX_PRECISION),
+                place.rating,
+                json.dumps(place.types or []),
+                place.model_dump_json(),
+                now,
+            )
+            for place in places
+            if place.place_id and place.location is not None
+        ]
+        if not rows:
+            return
+        self._write(
+            "INSERT OR REPLACE INTO places"
+            " (place_id, lat, lng, geohash, rating, types, payload, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def is_fresh(
+        self, lat: float, lng: float, radius_m: float, place_type: str | None, max_age: float
+    ) -> bool:
+        """True if one fresh covered circle contains the whole query circle."""
+        rows = self._conn.execute(
+            "SELECT lat, lng, radius_m FROM coverage"
+            " WHERE place_type = ? AND refreshed_at > ? AND radius_m >= ?",
+            (place_type or "*", time.time() - max_age, radius_m),
+        )
+        return any(
+            haversine_m(lat, lng, covered_lat, covered_lng) + radius_m <= covered_radius
+            for covered_lat, covered_lng, covered_radius in rows
+        )
+
+    def mark_covered(
+        self, lat: float, lng: float, radius_m: float, place_type: str | None, max_age: float
+    ) -> None:
+        """Record a complete circle; circles older than ``max_age`` are dropped."""
+        now = time.time()
+        self._write("DELETE FROM coverage WHERE refreshed_at <= ?", [(now - max_age,)])
+        if radius_m > 0:
+            self._write(
+                "INSERT INTO coverage (lat, lng, radius_m, place_type, refreshed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(lat, lng, radius_m, place_type or "*", now)],
+            )
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        *,
+        cells: list[str],
+        place_type: str | None = None,
+        min_rating: float | None = None,
+        limit: int = 20,
+    ) -> list[PlaceSummary]:
+        matches: list[tuple[float, str]] = []
+        for cell in cells:
+            rows = self._conn.execute(
+                "SELECT lat, lng, rating, types, payload FROM places"
+                " WHERE geohash >= ? AND geohash < ?",
+                (cell, cell + "~"),
+            )
+            for row_lat, row_lng, rating, types, payload in rows:
+                if min_rating is not None and (rating is None or rating < min_rating):
+                    continue
+                if place_type and place_type not in json.loads(types):
+                    continue
+                distance = haversine_m(lat, lng, row_lat, row_lng)
+                if distance <= radius_m:
+                    matches.append((distance, payload))
+        matches.sort(key=lambda match: match[0])
+        return [PlaceSummary.model_validate_json(payload) for _, payload in matches[:limit]]
+
+    def flush(self) -> None:
+        """Commit every queued write in one transaction."""
+        if self._writer_conn is None:
+            return
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with self._writer_conn:
+                    for sql, rows in pending:
+                        self._writer_conn.executemany(sql, rows)
+            except sqlite3.Error as exc:
+                self.write_errors += 1
+                logger.warning(
+                    "Geo index write failed, dropped %d queued writes: %s", len(pending), exc
+                )
+
+    def _write(self, sql: str, rows: list[tuple[object, ...]]) -> None:
+        if self._writer_conn is None:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+            return
+        with self._lock:
+            self._pending.append((sql, rows))
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            # Let writes arriving in the same burst join this batch.
+            time.sleep(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stats(self) -> dict[str, int]:
+        (places,) = self._conn.execute("SELECT COUNT(*) FROM places").fetchone()
+        (circles,) = self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()
+        return {"places": places, "covered_circles": circles}
@@ -1,17 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
 import os
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, TypeVar
+from urllib.parse import quote, urlsplit
 
 import httpx
 from fastapi import HTTPException
+from pydantic import BaseModel
 
+from local_places.cache import CacheEntry, TTLCache
+from local_places.geo_index import PlaceIndex, covering_cells, haversine_m
+from local_places.metrics import (
+    UPSTREAM_IN_FLIGHT,
+    observe_stage,
+    observe_upstream,
+)
+from local_places.prefetch import Prefetcher
+from local_places.ratelimit import TokenBucket
+from local_places.recorder import Recorder
+from local_places.refresh import Refresher
+from local_places.resilience import CircuitBreaker, backoff_delay, parse_retry_after
+from local_places.resolver import LocalResolver, load_aliases
+from local_places.settings import UpstreamSettings
+from local_places.singleflight import SingleFlight
+from local_places.wire import (
+    WireLatLng,
+    WireOpeningHours,
+    WirePlace,
+    WireSearchResponse,
+    WireText,
+)
 from local_places.schemas import (
     LatLng,
     LocationResolveRequest,
     LocationResolveResponse,
+    NearbyRequest,
+    NearbyResponse,
     PlaceDetails,
+    PlaceDetailsBatchRequest,
+    PlaceDetailsBatchResponse,
+    PlaceDetailsError,
     PlaceSummary,
     ResolvedLocation,
     SearchRequest,
@@ -21,8 +56,40 @@ from local_places.schemas import (
 GOOGLE_PLACES_BASE_URL = os.getenv(
     "GOOGLE_PLACES_BASE_URL", "https://places.googleapis.com/v1"
 )
+_SEARCH_TEXT_URL = f"{GOOGLE_PLACES_BASE_URL}/places:searchText"
+_SEARCH_NEARBY_URL = f"{GOOGLE_PLACES_BASE_URL}/places:searchNearby"
+_PLACE_URL_PREFIX = f"{GOOGLE_PLACES_BASE_URL}/places/"
+GOOGLE_PLACES_TIMEOUT = float(os.getenv("GOOGLE_PLACES_TIMEOUT", "10.0"))
+GOOGLE_PLACES_MAX_CONNECTIONS = int(os.getenv("GOOGLE_PLACES_MAX_CONNECTIONS", "100"))
+GOOGLE_PLACES_MAX_KEEPALIVE = int(os.getenv("GOOGLE_PLACES_MAX_KEEPALIVE", "20"))
+GOOGLE_PLACES_KEEPALIVE_EXPIRY = float(
+    os.getenv("GOOGLE_PLACES_KEEPALIVE_EXPIRY", "30.0")
+)
+GOOGLE_PLACES_HTTP2 = os.getenv("GOOGLE_PLACES_HTTP2", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+GOOGLE_PLACES_BATCH_CONCURRENCY = int(os.getenv("GOOGLE_PLACES_BATCH_CONCURRENCY", "8"))
+GOOGLE_PLACES_MAX_RETRIES = int(os.getenv("GOOGLE_PLACES_MAX_RETRIES", "2"))
+GOOGLE_PLACES_RETRY_BASE_DELAY = float(os.getenv("GOOGLE_PLACES_RETRY_BASE_DELAY", "0.2"))
+GOOGLE_PLACES_RETRY_MAX_DELAY = float(os.getenv("GOOGLE_PLACES_RETRY_MAX_DELAY", "2.0"))
+GOOGLE_PLACES_RECORD_PATH = os.getenv("GOOGLE_PLACES_RECORD_PATH") or None
+LOCAL_PLACES_CACHE_DB = os.getenv("LOCAL_PLACES_CACHE_DB") or None
+LOCAL_PLACES_GEO_DB = os.getenv("LOCAL_PLACES_GEO_DB", ":memory:")
+LOCAL_PLACES_GEO_COVERAGE_TTL = float(os.getenv("LOCAL_PLACES_GEO_COVERAGE_TTL", "86400"))
+LOCAL_PLACES_RESOLVER_MIN_SCORE = float(os.getenv("LOCAL_PLACES_RESOLVER_MIN_SCORE", "0.85"))
+LOCAL_PLACES_RESOLVER_MAX_ENTRIES = int(os.getenv("LOCAL_PLACES_RESOLVER_MAX_ENTRIES", "5000"))
+LOCAL_PLACES_RESOLVER_ALIASES = os.getenv("LOCAL_PLACES_RESOLVER_ALIASES") or None
+LOCAL_PLACES_REFRESH_TOP_N = int(os.getenv("LOCAL_PLACES_REFRESH_TOP_N", "50"))
+LOCAL_PLACES_REFRESH_INTERVAL = float(os.getenv("LOCAL_PLACES_REFRESH_INTERVAL", "60"))
+LOCAL_PLACES_PREFETCH_TOP_K = int(os.getenv("LOCAL_PLACES_PREFETCH_TOP_K", "0"))
+LOCAL_PLACES_STALE_TTL = float(os.getenv("LOCAL_PLACES_STALE_TTL", "86400"))
+LOCAL_PLACES_SEARCH_GRID_DEG = float(os.getenv("LOCAL_PLACES_SEARCH_GRID_DEG", "0.001"))
 logger = logging.getLogger("local_places.google_places")
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 _PRICE_LEVEL_TO_ENUM = {
     0: "PRICE_LEVEL_FREE",
     1: "PRICE_LEVEL_INEXPENSIVE",
@@ -44,6 +111,15 @@ _SEARCH_FIELD_MASK = (
     "nextPageToken"
 )
 
+# Text Search returns the same place fields as Place Details, so enriching search
+# results only widens the field mask instead of costing a round-trip per result.
+_SEARCH_DETAILS_FIELD_MASK = (
+    f"{_SEARCH_FIELD_MASK},"
+    "places.regularOpeningHours,"
+    "places.nationalPhoneNumber,"
+    "places.websiteUri"
+)
+
 _DETAILS_FIELD_MASK = (
     "id,"
     "displayName,"
@@ -58,6 +134,36 @@ _DETAILS_FIELD_MASK = (
     "websiteUri"
 )
 
+# Response field -> Places API field for the `fields` selector. Place IDs are always
+# requested; the dict order is the canonical order of the generated masks.
+_FIELD_MASK_PATHS = {
+    "name": "displayName",
+    "address": "formattedAddress",
+    "location": "location",
+    "rating": "rating",
+    "price_level": "priceLevel",
+    "types": "types",
+    "open_now": "currentOpeningHours",
+    "hours": "regularOpeningHours",
+    "phone": "nationalPhoneNumber",
+    "website": "websiteUri",
+}
+_DETAILS_ONLY_FIELDS = frozenset({"hours", "phone", "website"})
+
+_NEARBY_FIELD_MASK = (
+    "places.id,"
+    "places.displayName,"
+    "places.formattedAddress,"
+    "places.location,"
+    "places.rating,"
+    "places.priceLevel,"
+    "places.types,"
+    "places.currentOpeningHours"
+)
+
+# searchNearby returns at most this many places, nearest first.
+_NEARBY_MAX_RESULTS = 20
+
 _RESOLVE_FIELD_MASK = (
     "places.id,"
     "places.displayName,"
@@ -67,50 +173,529 @@ _RESOLVE_FIELD_MASK = (
 )
 
 
+def _soft_ttl(name: str, default: str) -> float | None:
+    value = os.getenv(name, default)
+    return float(value) if value else None
+
+
+_details_cache: TTLCache[PlaceDetails] = TTLCache(
+    "details",
+    PlaceDetails,
+    ttl=float(os.getenv("LOCAL_PLACES_DETAILS_TTL", "3600")),
+    soft_ttl=_soft_ttl("LOCAL_PLACES_DETAILS_SOFT_TTL", "1800"),
+    max_entries=int(os.getenv("LOCAL_PLACES_DETAILS_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("LOCAL_PLACES_DETAILS_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+    stale_ttl=LOCAL_PLACES_STALE_TTL,
+    db_path=LOCAL_PLACES_CACHE_DB,
+)
+
+_search_cache: TTLCache[SearchResponse] = TTLCache(
+    "search",
+    SearchResponse,
+    ttl=float(os.getenv("LOCAL_PLACES_SEARCH_TTL", "600")),
+    soft_ttl=_soft_ttl("LOCAL_PLACES_SEARCH_SOFT_TTL", "300"),
+    max_entries=int(os.getenv("LOCAL_PLACES_SEARCH_CACHE_MAX_ENTRIES", "512")),
+    max_bytes=int(os.getenv("LOCAL_PLACES_SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    stale_ttl=LOCAL_PLACES_STALE_TTL,
+    db_path=LOCAL_PLACES_CACHE_DB,
+)
+_SEARCH_OPEN_NOW_TTL = float(os.getenv("LOCAL_PLACES_SEARCH_OPEN_NOW_TTL", "120"))
+
+_resolve_cache: TTLCache[LocationResolveResponse] = TTLCache(
+    "resolve",
+    LocationResolveResponse,
+    ttl=float(os.getenv("LOCAL_PLACES_RESOLVE_TTL", "86400")),
+    soft_ttl=_soft_ttl("LOCAL_PLACES_RESOLVE_SOFT_TTL", "43200"),
+    max_entries=int(os.getenv("LOCAL_PLACES_RESOLVE_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(os.getenv("LOCAL_PLACES_RESOLVE_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+    stale_ttl=LOCAL_PLACES_STALE_TTL,
+    db_path=LOCAL_PLACES_CACHE_DB,
+)
+
+_flights: SingleFlight[Any] = SingleFlight()
+_refresher = Refresher()
+_prefetcher = Prefetcher(
+    workers=int(os.getenv("LOCAL_PLACES_PREFETCH_WORKERS", "2")),
+    queue_size=int(os.getenv("LOCAL_PLACES_PREFETCH_QUEUE_SIZE", "32")),
+    budget_per_minute=int(os.getenv("LOCAL_PLACES_PREFETCH_BUDGET_PER_MIN", "60")),
+)
+_recorder = Recorder(GOOGLE_PLACES_RECORD_PATH) if GOOGLE_PLACES_RECORD_PATH else None
+_refresh_task: asyncio.Task[None] | None = None
+
+_place_index = PlaceIndex(LOCAL_PLACES_GEO_DB) if LOCAL_PLACES_GEO_DB else None
+
+_resolver = LocalResolver(
+    threshold=LOCAL_PLACES_RESOLVER_MIN_SCORE,
+    max_entries=LOCAL_PLACES_RESOLVER_MAX_ENTRIES,
+    aliases=load_aliases(LOCAL_PLACES_RESOLVER_ALIASES),
+    # Learned answers age out with the resolve cache, so they are refetched as often.
+    max_age=_resolve_cache.ttl if _resolve_cache.ttl > 0 else None,
+)
+
+
+def _circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_ratio=float(os.getenv("GOOGLE_PLACES_BREAKER_FAILURE_RATIO", "0.5")),
+        min_requests=int(os.getenv("GOOGLE_PLACES_BREAKER_MIN_REQUESTS", "10")),
+        window=float(os.getenv("GOOGLE_PLACES_BREAKER_WINDOW", "30")),
+        cooldown=float(os.getenv("GOOGLE_PLACES_BREAKER_COOLDOWN", "15")),
+    )
+
+
+# One breaker per upstream method, so a failing method does not take down the others.
+_breakers = {
+    "searchText": _circuit_breaker(),
+    "details": _circuit_breaker(),
+    "searchNearby": _circuit_breaker(),
+}
+
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _rate_limiter(endpoint: str, env_prefix: str) -> TokenBucket:
+    return TokenBucket(
+        endpoint,
+        rate_per_minute=float(os.getenv(f"{env_prefix}_RATE_PER_MIN", "600")),
+        burst=float(os.getenv(f"{env_prefix}_BURST", "20")),
+        max_wait=float(os.getenv("GOOGLE_PLACES_RATE_LIMIT_MAX_WAIT", "2.0")),
+    )
+
+
+_rate_limiters = {
+    "searchText": _rate_limiter("searchText", "GOOGLE_PLACES_SEARCH"),
+    "details": _rate_limiter("details", "GOOGLE_PLACES_DETAILS"),
+    "searchNearby": _rate_limiter("searchNearby", "GOOGLE_PLACES_NEARBY"),
+}
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    return {
+        "details": _details_cache.stats(),
+        "search": _search_cache.stats(),
+        "resolve": _resolve_cache.stats(),
+    }
+
+
+def rate_limit_stats() -> dict[str, dict[str, Any]]:
+    return {name: limiter.stats() for name, limiter in _rate_limiters.items()}
+
+
+def geo_index_stats() -> dict[str, int] | None:
+    return _place_index.stats() if _place_index is not None else None
+
+
+def flush_place_index() -> None:
+    """Commit queued geo index writes. Called from the app lifespan on shutdown."""
+    if _place_index is not None:
+        _place_index.flush()
+
+
+def resolver_stats() -> dict[str, Any]:
+    return _resolver.stats()
+
+
+def refresh_stats() -> dict[str, int]:
+    return _refresher.stats()
+
+
+def prefetch_stats() -> dict[str, Any]:
+    return _prefetcher.stats()
+
+
+def breaker_stats() -> dict[str, dict[str, Any]]:
+    return {endpoint: breaker.stats() for endpoint, breaker in _breakers.items()}
+
+
+def flight_stats() -> dict[str, int]:
+    return {
+        "upstream_calls": _flights.calls,
+        "coalesced": _flights.shared,
+        "in_flight": _flights.in_flight,
+    }
+
+
+def search_cache_ttl(request: SearchRequest) -> float:
+    if request.filters and request.filters.open_now:
+        return min(_search_cache.ttl, _SEARCH_OPEN_NOW_TTL)
+    return _search_cache.ttl
+
+
+def details_cache_ttl() -> float:
+    return _details_cache.ttl
+
+
+def resolve_cache_ttl() -> float:
+    return _resolve_cache.ttl
+
+
+def _canonical_hash(body: dict[str, Any]) -> str:
+    encoded = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _quantize(value: float) -> float:
+    if LOCAL_PLACES_SEARCH_GRID_DEG <= 0:
+        return value
+    return round(round(value / LOCAL_PLACES_SEARCH_GRID_DEG) * LOCAL_PLACES_SEARCH_GRID_DEG, 7)
+
+
+def _selected_field_mask(fields: list[str], prefix: str = "") -> str:
+    paths = [path for field, path in _FIELD_MASK_PATHS.items() if field in fields]
+    return ",".join(f"{prefix}{path}" for path in ("id", *paths))
+
+
+def _search_field_mask(request: SearchRequest) -> str:
+    if request.fields is not None:
+        return f"{_selected_field_mask(request.fields, 'places.')},nextPageToken"
+    return _SEARCH_DETAILS_FIELD_MASK if request.include_details else _SEARCH_FIELD_MASK
+
+
+def _details_field_mask(fields: list[str] | None) -> str:
+    return _DETAILS_FIELD_MASK if fields is None else _selected_field_mask(fields)
+
+
+def _wants_details(request: SearchRequest) -> bool:
+    if request.fields is not None:
+        return not _DETAILS_ONLY_FIELDS.isdisjoint(request.fields)
+    return request.include_details
+
+
+def _search_cache_key(body: dict[str, Any], field_mask: str) -> str:
+    # Snap the bias center onto a grid so near-identical coordinates share an entry.
+    circle = body.get("locationBias", {}).get("circle")
+    if circle:
+        center = circle["center"]
+        body = {
+            **body,
+            "locationBias": {
+                "circle": {
+                    "center": {
+                        "latitude": _quantize(center["latitude"]),
+                        "longitude": _quantize(center["longitude"]),
+                    },
+                    "radius": circle["radius"],
+                }
+            },
+        }
+    return _canonical_hash({**body, "fieldMask": field_mask})
+
+
+def _resolve_cache_key(body: dict[str, Any]) -> str:
+    text = " ".join(body["textQuery"].split()).casefold()
+    return _canonical_hash({**body, "textQuery": text})
+
+
 class _GoogleResponse:
     def __init__(self, response: httpx.Response):
         self.status_code = response.status_code
         self._response = response
 
-    def json(self) -> dict[str, Any]:
-        return self._response.json()
+    def parse(self, model: type[ModelT]) -> ModelT:
+        started = time.perf_counter()
+        payload = model.model_validate_json(self._response.content)
+        observe_stage("decode", started)
+        return payload
 
     @property
     def text(self) -> str:
         return self._response.text
 
 
-def _api_headers(field_mask: str) -> dict[str, str]:
-    api_key = os.getenv("GOOGLE_PLACES_API_KEY")
-    if not api_key:
+_settings = UpstreamSettings.load()
+
+
+def validate_settings() -> bool:
+    """Check the upstream configuration once at startup. Called from the app lifespan."""
+    return _settings.validate()
+
+
+def reload_settings(api_key: str | None = None) -> dict[str, Any]:
+    """Swap in a new API key, from ``api_key`` or re-read from the environment/key file.
+
+    Settings that fail validation are not swapped in: the current key keeps
+    working and the reload raises a 500.
+    """
+    global _settings
+    settings = UpstreamSettings(api_key, "admin") if api_key else UpstreamSettings.load()
+    if not settings.validate():
+        logger.error("Keeping the Google Places settings loaded from %s.", _settings.source)
         raise HTTPException(
             status_code=500,
-            detail="GOOGLE_PLACES_API_KEY is not set.",
+            detail="Reloaded settings have no API key; kept the previous settings.",
         )
-    return {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": api_key,
-        "X-Goog-FieldMask": field_mask,
-    }
+    _settings = settings
+    logger.info("Reloaded Google Places settings from %s.", settings.source)
+    return settings.describe()
+
+
+def settings_info() -> dict[str, Any]:
+    return _settings.describe()
+
+
+_client: httpx.AsyncClient | None = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=GOOGLE_PLACES_TIMEOUT,
+        http2=GOOGLE_PLACES_HTTP2,
+        limits=httpx.Limits(
+            max_connections=GOOGLE_PLACES_MAX_CONNECTIONS,
+            max_keepalive_connections=GOOGLE_PLACES_MAX_KEEPALIVE,
+            keepalive_expiry=GOOGLE_PLACES_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+async def open_client() -> None:
+    """Create the shared upstream client. Called from the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+
+async def close_client() -> None:
+    """Close the shared upstream client and drop its pooled connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+async def start_background_refresh() -> None:
+    """Start the hot-entry refresh loop. Called from the app lifespan."""
+    global _refresh_task
+    if _refresh_task is None and LOCAL_PLACES_REFRESH_TOP_N > 0 and _details_cache.enabled:
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def start_prefetch() -> None:
+    """Start the speculative details workers if LOCAL_PLACES_PREFETCH_TOP_K is set."""
+    if LOCAL_PLACES_PREFETCH_TOP_K > 0 and _details_cache.enabled:
+        _prefetcher.start()
 
 
-def _request(
-    method: str, url: str, payload: dict[str, Any] | None, field_mask: str
+async def stop_prefetch() -> None:
+    await _prefetcher.stop()
+
+
+async def prefetch_details(request: SearchRequest, response: SearchResponse) -> int:
+    """Queue details fetches for the top results of a search that was just answered.
+
+    Run as a background task after the response is sent. Searches that already
+    carry details or select trimmed fields are skipped, as are places whose
+    details are cached. It is async, though it never awaits, so Starlette runs
+    it on the event loop: the prefetch queue is not thread-safe.
+    """
+    if not _prefetcher.running or request.include_details or request.fields is not None:
+        return 0
+    queued = 0
+    now = time.time()
+    for result in response.results[:LOCAL_PLACES_PREFETCH_TOP_K]:
+        if not result.place_id:
+            continue
+        cache_key = _details_cache_key(result.place_id)
+        entry = _details_cache.peek(cache_key)
+        if entry is not None and entry.expires_at > now:
+            continue
+        flight_key = f"details:{cache_key}"
+        fetch = functools.partial(_fetch_place_details, result.place_id, cache_key)
+        queued += _prefetcher.offer(cache_key, functools.partial(_flights.do, flight_key, fetch))
+    return queued
+
+
+async def stop_background_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        task, _refresh_task = _refresh_task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    await _refresher.close()
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(LOCAL_PLACES_REFRESH_INTERVAL)
+        refresh_hot_details()
+
+
+def refresh_hot_details() -> int:
+    """Revalidate the most-hit details entries that go soft before the next tick.
+
+    Only the details cache is refreshed proactively: its key carries the place
+    ID, while search and resolve keys are hashes that cannot be replayed.
+    """
+    due_before = time.time() + LOCAL_PLACES_REFRESH_INTERVAL
+    scheduled = 0
+    for cache_key in _details_cache.hottest(LOCAL_PLACES_REFRESH_TOP_N, due_before):
+        place_id, field_mask = cache_key.split("|", 1)
+        flight_key = f"details:{cache_key}"
+        fetch = functools.partial(_fetch_place_details, place_id, cache_key, field_mask)
+        scheduled += _refresher.schedule(
+            flight_key, functools.partial(_flights.do, flight_key, fetch)
+        )
+    _details_cache.decay_hits()
+    return scheduled
+
+
+def _get_client() -> httpx.AsyncClient:
+    # Fall back to a lazily created client when used outside the app lifespan.
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+def _retry_delay(attempt: int) -> float:
+    return backoff_delay(attempt, GOOGLE_PLACES_RETRY_BASE_DELAY, GOOGLE_PLACES_RETRY_MAX_DELAY)
+
+
+async def _request(
+    method: str,
+    url: str,
+    payload: dict[str, Any] | None,
+    field_mask: str,
+    *,
+    endpoint: str,
+    idempotent: bool | None = None,
 ) -> _GoogleResponse:
+    """Send one upstream call through the endpoint's circuit breaker.
+
+    ``endpoint`` names the upstream method ("searchText", "details" or
+    "searchNearby") whose rate limiter and circuit breaker the call uses.
+    Idempotent calls (GET by default) are retried with jittered backoff on
+    connection errors and 429/5xx responses, honouring Retry-After. Timeouts
+    are not retried so a slow upstream cannot multiply request latency.
+    Every attempt spends a token from the endpoint's rate limiter first.
+
+    The breaker sees one outcome per call, not per attempt. A final 429 is
+    left out of its failure ratio: quota is handled by the limiter and
+    Retry-After, not by cutting the upstream off.
+    """
+    started = time.perf_counter()
+    headers = _settings.headers(field_mask)
+    observe_stage("headers", started)
+    if idempotent is None:
+        idempotent = method == "GET"
+    retries = GOOGLE_PLACES_MAX_RETRIES if idempotent else 0
+    limiter = _rate_limiters[endpoint]
+    breaker = _breakers[endpoint]
+    if not breaker.allow():
+        raise HTTPException(status_code=503, detail="Google Places API temporarily unavailable.")
+
+    # None leaves the call out of the breaker's ratio (429s, local rejections, bugs).
+    succeeded: bool | None = None
     try:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.request(
-                method=method,
-                url=url,
-                headers=_api_headers(field_mask),
-                json=payload,
+        for attempt in range(retries + 1):
+            if not await limiter.acquire():
+                raise HTTPException(
+                    status_code=429,
+                    detail="Google Places API rate limit reached; try again shortly.",
+                    headers={"Retry-After": str(max(int(limiter.retry_after() + 0.999), 1))},
+                )
+            started = time.perf_counter()
+            UPSTREAM_IN_FLIGHT.inc()
+            try:
+                response = await _get_client().request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=payload,
+                )
+            except httpx.HTTPError as exc:
+                observe_upstream(limiter.name, "error")
+                succeeded = False
+                if attempt < retries and not isinstance(exc, httpx.TimeoutException):
+                    await asyncio.sleep(_retry_delay(attempt))
+                    continue
+                raise HTTPException(
+                    status_code=502, detail="Google Places API unavailable."
+                ) from exc
+            finally:
+                UPSTREAM_IN_FLIGHT.dec()
+                observe_stage("upstream", started)
+
+            observe_upstream(limiter.name, response.status_code)
+            if response.status_code not in _RETRYABLE_STATUS:
+                succeeded = True
+                return _final_response(method, url, payload, field_mask, response)
+
+            succeeded = None if response.status_code == 429 else False
+            if attempt >= retries:
+                break
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = _retry_delay(attempt)
+            elif delay > GOOGLE_PLACES_RETRY_MAX_DELAY:
+                break
+            logger.warning(
+                "Google Places API returned %s, retrying in %.2fs.", response.status_code, delay
             )
-    except httpx.HTTPError as exc:
-        raise HTTPException(status_code=502, detail="Google Places API unavailable.") from exc
+            await asyncio.sleep(delay)
+    finally:
+        if succeeded is None:
+            breaker.release()
+        elif succeeded:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
 
+    return _final_response(method, url, payload, field_mask, response)
+
+
+def _final_response(
+    method: str,
+    url: str,
+    payload: dict[str, Any] | None,
+    field_mask: str,
+    response: httpx.Response,
+) -> _GoogleResponse:
+    if _recorder is not None:
+        _recorder.record(
+            method, urlsplit(url).path, payload, field_mask, response.status_code, response.content
+        )
     return _GoogleResponse(response)
 
 
+async def _fetch_or_stale(
+    cache: TTLCache[Any], cache_key: str, flight_key: str, fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Fetch through single-flight, falling back to a stale entry if upstream is down."""
+    try:
+        return await _flights.do(flight_key, fetch)
+    except HTTPException as exc:
+        if exc.status_code not in (429, 502, 503):
+            raise
+        stale = cache.get_stale(cache_key)
+        if stale is None:
+            raise
+        logger.warning("Serving stale %s entry after upstream failure: %s", cache.name, exc.detail)
+        return stale
+
+
+def _cached(
+    cache: TTLCache[ModelT],
+    cache_key: str,
+    flight_key: str,
+    fetch: Callable[[], Awaitable[ModelT]],
+) -> CacheEntry[ModelT] | None:
+    """Look up a fresh entry, revalidating it in the background once past its soft TTL."""
+    entry = cache.get_entry(cache_key)
+    if entry is None:
+        return None
+    if cache.is_due(entry):
+        _refresher.schedule(flight_key, functools.partial(_flights.do, flight_key, fetch))
+    return entry
+
+
+def _entry_for(cache: TTLCache[ModelT], cache_key: str, value: ModelT) -> CacheEntry[ModelT]:
+    """The cache entry holding a just-fetched value, so its encoding can be reused."""
+    entry = cache.peek(cache_key)
+    if entry is not None and entry.value is value:
+        return entry
+    return CacheEntry.uncached(value)
+
+
 def _build_text_query(request: SearchRequest) -> str:
     keyword = request.filters.keyword if request.filters else None
     if keyword:
@@ -154,32 +739,30 @@ def _build_search_body(request: SearchRequest) -> dict[str, Any]:
     return body
 
 
-def _parse_lat_lng(raw: dict[str, Any] | None) -> LatLng | None:
+def _parse_lat_lng(raw: WireLatLng | None) -> LatLng | None:
     if not raw:
         return None
-    latitude = raw.get("latitude")
-    longitude = raw.get("longitude")
-    if latitude is None or longitude is None:
+    if raw.latitude is None or raw.longitude is None:
         return None
-    return LatLng(lat=latitude, lng=longitude)
+    return LatLng(lat=raw.latitude, lng=raw.longitude)
 
 
-def _parse_display_name(raw: dict[str, Any] | None) -> str | None:
+def _parse_display_name(raw: WireText | None) -> str | None:
     if not raw:
         return None
-    return raw.get("text")
+    return raw.text
 
 
-def _parse_open_now(raw: dict[str, Any] | None) -> bool | None:
+def _parse_open_now(raw: WireOpeningHours | None) -> bool | None:
     if not raw:
         return None
-    return raw.get("openNow")
+    return raw.open_now
 
 
-def _parse_hours(raw: dict[str, Any] | None) -> list[str] | None:
+def _parse_hours(raw: WireOpeningHours | None) -> list[str] | None:
     if not raw:
         return None
-    return raw.get("weekdayDescriptions")
+    return raw.weekday_descriptions
 
 
 def _parse_price_level(raw: str | None) -> int | None:
@@ -188,9 +771,52 @@ def _parse_price_level(raw: str | None) -> int | None:
     return _ENUM_TO_PRICE_LEVEL.get(raw)
 
 
-def search_places(request: SearchRequest) -> SearchResponse:
-    url = f"{GOOGLE_PLACES_BASE_URL}/places:searchText"
-    response = _request("POST", url, _build_search_body(request), _SEARCH_FIELD_MASK)
+def _parse_place_details(place: WirePlace, place_id: str) -> PlaceDetails:
+    return PlaceDetails(
+        place_id=place.id or place_id,
+        name=_parse_display_name(place.display_name),
+        address=place.formatted_address,
+        location=_parse_lat_lng(place.location),
+        rating=place.rating,
+        price_level=_parse_price_level(place.price_level),
+        types=place.types,
+        phone=place.national_phone_number,
+        website=place.website_uri,
+        hours=_parse_hours(place.regular_opening_hours),
+        open_now=_parse_open_now(place.current_opening_hours),
+    )
+
+
+def _index_places(places: list[PlaceSummary | PlaceDetails]) -> None:
+    if _place_index is not None:
+        _place_index.add(places)
+
+
+async def search_places(request: SearchRequest) -> SearchResponse:
+    return (await search_places_entry(request)).value
+
+
+async def search_places_entry(request: SearchRequest) -> CacheEntry[SearchResponse]:
+    """Like ``search_places``, but with the encoded body and ETag alongside."""
+    body = _build_search_body(request)
+    cache_key = _search_cache_key(body, _search_field_mask(request))
+    flight_key = f"search:{cache_key}"
+    fetch = functools.partial(_fetch_search, request, body, cache_key)
+    cached = _cached(_search_cache, cache_key, flight_key, fetch)
+    if cached is not None:
+        return cached
+    value = await _fetch_or_stale(_search_cache, cache_key, flight_key, fetch)
+    return _entry_for(_search_cache, cache_key, value)
+
+
+async def _fetch_search(
+    request: SearchRequest, body: dict[str, Any], cache_key: str
+) -> SearchResponse:
+    url = _SEARCH_TEXT_URL
+    # searchText is a read-only POST, so it is safe to retry.
+    response = await _request(
+        "POST", url, body, _search_field_mask(request), endpoint="searchText", idempotent=True
+    )
 
     if response.status_code >= 400:
         logger.error(
@@ -204,7 +830,7 @@ def search_places(request: SearchRequest) -> SearchResponse:
         )
 
     try:
-        payload = response.json()
+        payload = response.parse(WireSearchResponse)
     except ValueError as exc:
         logger.error(
             "Google Places API returned invalid JSON. response=%s",
@@ -212,31 +838,103 @@ def search_places(request: SearchRequest) -> SearchResponse:
         )
         raise HTTPException(status_code=502, detail="Invalid Google response.") from exc
 
-    places = payload.get("places", [])
-    results = []
-    for place in places:
+    started = time.perf_counter()
+    wants_details = _wants_details(request)
+    details_mask = _details_field_mask(request.fields)
+    results: list[PlaceSummary | PlaceDetails] = []
+    for place in payload.places:
+        if wants_details:
+            details = _parse_place_details(place, "")
+            if details.place_id:
+                # Search returned exactly the fields a details call with this mask would.
+                _details_cache.set(_details_cache_key(details.place_id, details_mask), details)
+            results.append(details)
+            continue
         results.append(
             PlaceSummary(
-                place_id=place.get("id", ""),
-                name=_parse_display_name(place.get("displayName")),
-                address=place.get("formattedAddress"),
-                location=_parse_lat_lng(place.get("location")),
-                rating=place.get("rating"),
-                price_level=_parse_price_level(place.get("priceLevel")),
-                types=place.get("types"),
-                open_now=_parse_open_now(place.get("currentOpeningHours")),
+                place_id=place.id or "",
+                name=_parse_display_name(place.display_name),
+                address=place.formatted_address,
+                location=_parse_lat_lng(place.location),
+                rating=place.rating,
+                price_level=_parse_price_level(place.price_level),
+                types=place.types,
+                open_now=_parse_open_now(place.current_opening_hours),
             )
         )
 
-    return SearchResponse(
+    search_response = SearchResponse(
         results=results,
-        next_page_token=payload.get("nextPageToken"),
+        next_page_token=payload.next_page_token,
     )
+    observe_stage("parse", started)
+    if request.fields is None:
+        # Trimmed results lack the rating/types the nearby index filters on.
+        _index_places(results)
+    _search_cache.set(cache_key, search_response, ttl=search_cache_ttl(request))
+    return search_response
+
+
+async def search_pages(
+    request: SearchRequest, max_results: int
+) -> AsyncIterator[list[PlaceSummary | PlaceDetails]]:
+    """Yield result pages, following nextPageToken until max_results is reached.
+
+    The next page is requested as soon as the current one arrives, so it is
+    usually ready by the time the caller has consumed the current page.
+    """
+    remaining = max_results
+    pending: asyncio.Future[SearchResponse] | None = asyncio.ensure_future(
+        search_places(request)
+    )
+    try:
+        while pending is not None and remaining > 0:
+            page = await pending
+            pending = None
+            results = page.results[:remaining]
+            remaining -= len(results)
+            if page.next_page_token and remaining > 0 and results:
+                pending = asyncio.ensure_future(
+                    search_places(
+                        request.model_copy(update={"page_token": page.next_page_token})
+                    )
+                )
+            yield results
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 
-def get_place_details(place_id: str) -> PlaceDetails:
-    url = f"{GOOGLE_PLACES_BASE_URL}/places/{place_id}"
-    response = _request("GET", url, None, _DETAILS_FIELD_MASK)
+def _details_cache_key(place_id: str, field_mask: str = _DETAILS_FIELD_MASK) -> str:
+    return f"{place_id}|{field_mask}"
+
+
+async def get_place_details(place_id: str, fields: list[str] | None = None) -> PlaceDetails:
+    return (await get_place_details_entry(place_id, fields)).value
+
+
+async def get_place_details_entry(
+    place_id: str, fields: list[str] | None = None
+) -> CacheEntry[PlaceDetails]:
+    """Like ``get_place_details``, but with the encoded body and ETag alongside."""
+    field_mask = _details_field_mask(fields)
+    cache_key = _details_cache_key(place_id, field_mask)
+    flight_key = f"details:{cache_key}"
+    fetch = functools.partial(_fetch_place_details, place_id, cache_key, field_mask)
+    cached = _cached(_details_cache, cache_key, flight_key, fetch)
+    if cached is not None:
+        _prefetcher.claim(cache_key)
+        return cached
+    value = await _fetch_or_stale(_details_cache, cache_key, flight_key, fetch)
+    return _entry_for(_details_cache, cache_key, value)
+
+
+async def _fetch_place_details(
+    place_id: str, cache_key: str, field_mask: str = _DETAILS_FIELD_MASK
+) -> PlaceDetails:
+    # Batch IDs come from a JSON body and may contain "/" or ":"; keep them one path segment.
+    url = _PLACE_URL_PREFIX + quote(place_id, safe="")
+    response = await _request("GET", url, None, field_mask, endpoint="details")
 
     if response.status_code >= 400:
         logger.error(
@@ -250,7 +948,7 @@ def get_place_details(place_id: str) -> PlaceDetails:
         )
 
     try:
-        payload = response.json()
+        payload = response.parse(WirePlace)
     except ValueError as exc:
         logger.error(
             "Google Places API returned invalid JSON. response=%s",
@@ -258,25 +956,98 @@ def get_place_details(place_id: str) -> PlaceDetails:
         )
         raise HTTPException(status_code=502, detail="Invalid Google response.") from exc
 
-    return PlaceDetails(
-        place_id=payload.get("id", place_id),
-        name=_parse_display_name(payload.get("displayName")),
-        address=payload.get("formattedAddress"),
-        location=_parse_lat_lng(payload.get("location")),
-        rating=payload.get("rating"),
-        price_level=_parse_price_level(payload.get("priceLevel")),
-        types=payload.get("types"),
-        phone=payload.get("nationalPhoneNumber"),
-        website=payload.get("websiteUri"),
-        hours=_parse_hours(payload.get("regularOpeningHours")),
-        open_now=_parse_open_now(payload.get("currentOpeningHours")),
+    started = time.perf_counter()
+    details = _parse_place_details(payload, place_id)
+    observe_stage("parse", started)
+    if field_mask == _DETAILS_FIELD_MASK:
+        _index_places([details])
+    _details_cache.set(cache_key, details)
+    return details
+
+
+async def get_place_details_batch(
+    request: PlaceDetailsBatchRequest,
+) -> PlaceDetailsBatchResponse:
+    place_ids = list(dict.fromkeys(request.place_ids))
+    found: dict[str, PlaceDetails] = {}
+    missing: list[str] = []
+    for place_id in place_ids:
+        cache_key = _details_cache_key(place_id)
+        cached = _cached(
+            _details_cache,
+            cache_key,
+            f"details:{cache_key}",
+            functools.partial(_fetch_place_details, place_id, cache_key),
+        )
+        if cached is not None:
+            _prefetcher.claim(cache_key)
+            found[place_id] = cached.value
+        else:
+            missing.append(place_id)
+
+    errors: list[PlaceDetailsError] = []
+    semaphore = asyncio.Semaphore(max(GOOGLE_PLACES_BATCH_CONCURRENCY, 1))
+
+    async def fetch(place_id: str) -> None:
+        cache_key = _details_cache_key(place_id)
+        try:
+            async with semaphore:
+                found[place_id] = await _fetch_or_stale(
+                    _details_cache,
+                    cache_key,
+                    f"details:{cache_key}",
+                    functools.partial(_fetch_place_details, place_id, cache_key),
+                )
+        except HTTPException as exc:
+            errors.append(
+                PlaceDetailsError(
+                    place_id=place_id,
+                    status_code=exc.status_code,
+                    detail=str(exc.detail),
+                )
+            )
+        except Exception:
+            logger.exception("Fetching details for %s failed.", place_id)
+            errors.append(
+                PlaceDetailsError(
+                    place_id=place_id,
+                    status_code=500,
+                    detail="Failed to fetch place details.",
+                )
+            )
+
+    await asyncio.gather(*(fetch(place_id) for place_id in missing))
+
+    order = {place_id: index for index, place_id in enumerate(place_ids)}
+    errors.sort(key=lambda error: order[error.place_id])
+    return PlaceDetailsBatchResponse(
+        results=[found[place_id] for place_id in place_ids if place_id in found],
+        errors=errors,
     )
 
 
-def resolve_locations(request: LocationResolveRequest) -> LocationResolveResponse:
-    url = f"{GOOGLE_PLACES_BASE_URL}/places:searchText"
-    body = {"textQuery": request.location_text, "pageSize": request.limit}
-    response = _request("POST", url, body, _RESOLVE_FIELD_MASK)
+async def resolve_locations(request: LocationResolveRequest) -> LocationResolveResponse:
+    location_text = _resolver.expand(request.location_text)
+    body = {"textQuery": location_text, "pageSize": request.limit}
+    cache_key = _resolve_cache_key(body)
+    flight_key = f"resolve:{cache_key}"
+    fetch = functools.partial(_fetch_resolve, body, cache_key)
+    cached = _cached(_resolve_cache, cache_key, flight_key, fetch)
+    if cached is not None:
+        return cached.value
+    local = _resolver.lookup(location_text, request.limit)
+    if local is not None:
+        return local[0]
+    response = await _fetch_or_stale(_resolve_cache, cache_key, flight_key, fetch)
+    _resolver.learn(location_text, request.limit, response)
+    return response
+
+
+async def _fetch_resolve(body: dict[str, Any], cache_key: str) -> LocationResolveResponse:
+    url = _SEARCH_TEXT_URL
+    response = await _request(
+        "POST", url, body, _RESOLVE_FIELD_MASK, endpoint="searchText", idempotent=True
+    )
 
     if response.status_code >= 400:
         logger.error(
@@ -290,7 +1061,7 @@ def resolve_locations(request: LocationResolveRequest) -> LocationResolveRespons
         )
 
     try:
-        payload = response.json()
+        payload = response.parse(WireSearchResponse)
     except ValueError as exc:
         logger.error(
             "Google Places API returned invalid JSON. response=%s",
@@ -298,17 +1069,156 @@ def resolve_locations(request: LocationResolveRequest) -> LocationResolveRespons
         )
         raise HTTPException(status_code=502, detail="Invalid Google response.") from exc
 
-    places = payload.get("places", [])
+    started = time.perf_counter()
     results = []
-    for place in places:
+    for place in payload.places:
         results.append(
             ResolvedLocation(
-                place_id=place.get("id", ""),
-                name=_parse_display_name(place.get("displayName")),
-                address=place.get("formattedAddress"),
-                location=_parse_lat_lng(place.get("location")),
-                types=place.get("types"),
+                place_id=place.id or "",
+                name=_parse_display_name(place.display_name),
+                address=place.formatted_address,
+                location=_parse_lat_lng(place.location),
+                types=place.types,
             )
         )
 
-    return LocationResolveResponse(results=results)
+    resolve_response = LocationResolveResponse(results=results)
+    observe_stage("parse", started)
+    _resolve_cache.set(cache_key, resolve_response)
+    return resolve_response
+
+
+async def search_nearby(request: NearbyRequest) -> NearbyResponse:
+    """Answer a nearby query from the local place index when its circle is covered.
+
+    A query not contained in a circle fetched upstream for this place type
+    within the coverage TTL triggers one upstream searchNearby call; its
+    results are indexed and the query is then answered locally.
+    """
+    cells = covering_cells(request.lat, request.lng, request.radius_m)
+    if _place_index is not None and _place_index.is_fresh(
+        request.lat, request.lng, request.radius_m, request.type, LOCAL_PLACES_GEO_COVERAGE_TTL
+    ):
+        return NearbyResponse(results=_query_index(request, cells), source="local")
+
+    body = _build_nearby_body(request)
+    places = await _flights.do(
+        f"nearby:{_canonical_hash(body)}", lambda: _fetch_nearby(request, body)
+    )
+    if _place_index is not None:
+        return NearbyResponse(results=_query_index(request, cells), source="upstream")
+
+    matches = [
+        (haversine_m(request.lat, request.lng, place.location.lat, place.location.lng), place)
+        for place in places
+        if place.location is not None
+        and (request.min_rating is None or (place.rating or 0) >= request.min_rating)
+    ]
+    matches.sort(key=lambda match: match[0])
+    return NearbyResponse(
+        results=[place for _, place in matches[: request.limit]], source="upstream"
+    )
+
+
+def _query_index(request: NearbyRequest, cells: list[str]) -> list[PlaceSummary]:
+    assert _place_index is not None
+    return _place_index.nearby(
+        request.lat,
+        request.lng,
+        request.radius_m,
+        cells=cells,
+        place_type=request.type,
+        min_rating=request.min_rating,
+        limit=request.limit,
+    )
+
+
+def _build_nearby_body(request: NearbyRequest) -> dict[str, Any]:
+    # min_rating and limit are applied locally so one upstream call serves them all.
+    body: dict[str, Any] = {
+        "locationRestriction": {
+            "circle": {
+                "center": {"latitude": request.lat, "longitude": request.lng},
+                "radius": request.radius_m,
+            }
+        },
+        "maxResultCount": _NEARBY_MAX_RESULTS,
+        "rankPreference": "DISTANCE",
+    }
+    if request.type:
+        body["includedTypes"] = [request.type]
+    return body
+
+
+async def _fetch_nearby(
+    request: NearbyRequest, body: dict[str, Any]
+) -> list[PlaceSummary]:
+    url = _SEARCH_NEARBY_URL
+    # searchNearby is a read-only POST, so it is safe to retry.
+    response = await _request(
+        "POST", url, body, _NEARBY_FIELD_MASK, endpoint="searchNearby", idempotent=True
+    )
+
+    if response.status_code >= 400:
+        logger.error(
+            "Google Places API error %s. response=%s",
+            response.status_code,
+            response.text,
+        )
+        raise HTTPException(
+            status_code=502,
+            detail=f"Google Places API error ({response.status_code}).",
+        )
+
+    try:
+        payload = response.parse(WireSearchResponse)
+    except ValueError as exc:
+        logger.error(
+            "Google Places API returned invalid JSON. response=%s",
+            response.text,
+        )
+        raise HTTPException(status_code=502, detail="Invalid Google response.") from exc
+
+    started = time.perf_counter()
+    results = [
+        PlaceSummary(
+            place_id=place.id or "",
+            name=_parse_display_name(place.display_name),
+            address=place.formatted_address,
+            location=_parse_lat_lng(place.location),
+            rating=place.rating,
+            price_level=_parse_price_level(place.price_level),
+            types=place.types,
+            open_now=_parse_open_now(place.current_opening_hours),
+        )
+        for place in payload.places
+    ]
+    observe_stage("parse", started)
+    if _place_index is not None:
+        _place_index.add(results)
+        _place_index.mark_covered(
+            request.lat,
+            request.lng,
+            _complete_radius(request, results),
+            request.type,
+            LOCAL_PLACES_GEO_COVERAGE_TTL,
+        )
+    return results
+
+
+def _complete_radius(request: NearbyRequest, results: list[PlaceSummary]) -> float:
+    """Radius around the query center within which upstream returned every place.
+
+    A full page is truncated: results are ranked by distance, so only the
+    circle out to the farthest returned place is known to be complete.
+    """
+    if len(results) < _NEARBY_MAX_RESULTS:
+        return request.radius_m
+    return max(
+        (
+            haversine_m(request.lat, request.lng, place.location.lat, place.location.lng)
+            for place in results
+            if place.location is not None
+        ),
+        default=0.0,
+    )
@@ -1,32 +1,210 @@
+import asyncio
+import hmac
 import logging
 import os
+import json
+import signal
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, get_args
 
-from fastapi import FastAPI, Request
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Request, Response
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 
-from local_places.google_places import get_place_details, resolve_locations, search_places
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional: pip install "local_places[brotli]"
+    BrotliMiddleware = None
+
+from local_places.cache import CacheEntry, flush_disk_tiers, payload_etag
+from local_places.google_places import (
+    breaker_stats,
+    cache_stats,
+    close_client,
+    details_cache_ttl,
+    flight_stats,
+    flush_place_index,
+    geo_index_stats,
+    get_place_details_batch,
+    get_place_details_entry,
+    open_client,
+    prefetch_details,
+    prefetch_stats,
+    rate_limit_stats,
+    resolve_cache_ttl,
+    resolve_locations,
+    refresh_stats,
+    reload_settings,
+    resolver_stats,
+    search_cache_ttl,
+    search_nearby,
+    search_pages,
+    search_places_entry,
+    settings_info,
+    start_background_refresh,
+    start_prefetch,
+    stop_background_refresh,
+    stop_prefetch,
+    validate_settings,
+)
+from local_places.metrics import (
+    MetricsMiddleware,
+    register_stats,
+    render_latest,
+    timed_handler,
+)
 from local_places.schemas import (
     LocationResolveRequest,
     LocationResolveResponse,
+    NearbyRequest,
+    NearbyResponse,
     PlaceDetails,
+    PlaceDetailsBatchRequest,
+    PlaceDetailsBatchResponse,
+    PlaceField,
     SearchRequest,
     SearchResponse,
+    SearchStreamRequest,
+    SettingsInfo,
+    SettingsReloadRequest,
+)
+
+
+def _reload_on_signal() -> None:
+    try:
+        reload_settings()
+    except HTTPException:
+        pass  # already logged; the previous settings stay in use
+
+
+def _install_reload_signal() -> bool:
+    """Reload the API key on SIGHUP. Only possible from the main thread on POSIX."""
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, _reload_on_signal)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        return False
+    return True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    validate_settings()
+    reload_on_signal = _install_reload_signal()
+    await open_client()
+    await start_background_refresh()
+    await start_prefetch()
+    try:
+        yield
+    finally:
+        await stop_prefetch()
+        await stop_background_refresh()
+        await close_client()
+        await asyncio.to_thread(flush_disk_tiers)
+        await asyncio.to_thread(flush_place_index)
+        if reload_on_signal:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+
+
+# Return pre-encoded JSON bodies instead of letting FastAPI re-process response models.
+LOCAL_PLACES_FAST_RESPONSES = os.getenv("LOCAL_PLACES_FAST_RESPONSES", "0").lower() in (
+    "1",
+    "true",
+    "yes",
 )
 
+
 app = FastAPI(
     title="My API",
+    lifespan=lifespan,
     servers=[{"url": os.getenv("OPENAPI_SERVER_URL", "http://maxims-macbook-air:8000")}],
 )
+# Bodies below the threshold are sent as-is; compressing them costs more than it saves.
+LOCAL_PLACES_COMPRESS_MIN_BYTES = int(os.getenv("LOCAL_PLACES_COMPRESS_MIN_BYTES", "1024"))
+if LOCAL_PLACES_COMPRESS_MIN_BYTES > 0:
+    if BrotliMiddleware is not None:
+        # Falls back to gzip for clients that do not accept br.
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=int(os.getenv("LOCAL_PLACES_BROTLI_QUALITY", "4")),
+            minimum_size=LOCAL_PLACES_COMPRESS_MIN_BYTES,
+            gzip_fallback=True,
+        )
+    else:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=LOCAL_PLACES_COMPRESS_MIN_BYTES,
+            compresslevel=int(os.getenv("LOCAL_PLACES_GZIP_LEVEL", "6")),
+        )
+# Added last so it is outermost and its timings include compression.
+app.add_middleware(MetricsMiddleware)
 logger = logging.getLogger("local_places.validation")
 
 
 @app.get("/ping")
-def ping() -> dict[str, str]:
+async def ping() -> dict[str, str]:
     return {"message": "pong"}
 
 
+def _collect_stats() -> dict[str, Any]:
+    return {
+        "caches": cache_stats(),
+        "coalescing": flight_stats(),
+        "circuit_breaker": breaker_stats(),
+        "rate_limits": rate_limit_stats(),
+        "geo_index": geo_index_stats(),
+        "resolver": resolver_stats(),
+        "refresh": refresh_stats(),
+        "prefetch": prefetch_stats(),
+    }
+
+
+register_stats(_collect_stats)
+
+
+@app.get("/stats")
+async def stats() -> dict[str, Any]:
+    return _collect_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+LOCAL_PLACES_ADMIN_TOKEN = os.getenv("LOCAL_PLACES_ADMIN_TOKEN") or None
+
+
+def _require_admin(authorization: str | None) -> None:
+    # Without a configured token the admin endpoints do not exist.
+    if LOCAL_PLACES_ADMIN_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), LOCAL_PLACES_ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+@app.get("/admin/settings", response_model=SettingsInfo, include_in_schema=False)
+async def admin_settings(authorization: str | None = Header(default=None)) -> SettingsInfo:
+    _require_admin(authorization)
+    return SettingsInfo(**settings_info())
+
+
+@app.post("/admin/settings:reload", response_model=SettingsInfo, include_in_schema=False)
+async def admin_reload_settings(
+    request: SettingsReloadRequest | None = None,
+    authorization: str | None = Header(default=None),
+) -> SettingsInfo:
+    _require_admin(authorization)
+    return SettingsInfo(**reload_settings(request.api_key if request else None))
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
@@ -44,22 +222,216 @@ async def validation_exception_handler(
     )
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison: W/ prefixes are ignored on both sides.
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _json_response(body: bytes, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _selected(fields: list[str] | None) -> set[str] | None:
+    """Response keys to keep for a `fields` selector; None keeps everything."""
+    return None if fields is None else {"place_id", *fields}
+
+
+def _fast_or_model(model: BaseModel) -> BaseModel | Response:
+    # Models come from our own parsers, so encode once with pydantic-core and skip
+    # FastAPI's response_model validation and encoding pass.
+    if LOCAL_PLACES_FAST_RESPONSES:
+        return _json_response(model.model_dump_json().encode())
+    return model
+
+
+def _conditional(http_request: Request, body: bytes, etag: str, max_age: float) -> Response:
+    """Send ``body`` with ETag/Cache-Control headers, or a 304 if the client is current."""
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(max_age)}"}
+    if _etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return _json_response(body, headers)
+
+
+def _cacheable(
+    http_request: Request,
+    entry: CacheEntry[Any],
+    max_age: float,
+    include: Any = None,
+) -> Response:
+    # Untrimmed responses reuse the cached encoding and its memoized ETag, so a
+    # cache hit neither re-serializes nor re-hashes the body.
+    if include is None:
+        return _conditional(http_request, entry.payload, entry.etag, max_age)
+    body = entry.value.model_dump_json(include=include).encode()
+    return _conditional(http_request, body, payload_etag(body), max_age)
+
+
 @app.post("/places/search", response_model=SearchResponse)
-def places_search(request: SearchRequest) -> SearchResponse:
-    return search_places(request)
+@timed_handler
+async def places_search(
+    request: SearchRequest, http_request: Request, background_tasks: BackgroundTasks
+) -> Response:
+    entry = await search_places_entry(request)
+    background_tasks.add_task(prefetch_details, request, entry.value)
+    selected = _selected(request.fields)
+    include = None
+    if selected is not None:
+        include = {"results": {"__all__": selected}, "next_page_token": True}
+    return _cacheable(http_request, entry, search_cache_ttl(request), include)
+
+
+def _stream_event(event: str, data: str, sse: bool) -> bytes:
+    if sse:
+        return f"event: {event}\ndata: {data}\n\n".encode()
+    if event == "error":
+        return f'{{"error":{data}}}\n'.encode()
+    return f"{data}\n".encode()
+
+
+@app.post("/places/search:stream")
+@timed_handler
+async def places_search_stream(
+    request: SearchStreamRequest, http_request: Request
+) -> StreamingResponse:
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    pages = search_pages(request, request.max_results)
+    # Fetch the first page before streaming so upstream errors keep their status code.
+    first_page = await anext(pages)
+    selected = _selected(request.fields)
+
+    async def body() -> AsyncIterator[bytes]:
+        page: list[BaseModel] | None = first_page
+        try:
+            while page is not None:
+                for result in page:
+                    yield _stream_event("place", result.model_dump_json(include=selected), sse)
+                page = await anext(pages, None)
+        except HTTPException as exc:
+            error = {"status_code": exc.status_code, "detail": exc.detail}
+            yield _stream_event("error", json.dumps(error, separators=(",", ":")), sse)
+            return
+        finally:
+            await pages.aclose()
+        if sse:
+            yield _stream_event("end", "{}", sse)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream" if sse else "application/x-ndjson"
+    )
+
+
+@app.post("/places/nearby", response_model=NearbyResponse)
+@timed_handler
+async def places_nearby(request: NearbyRequest) -> NearbyResponse | Response:
+    return _fast_or_model(await search_nearby(request))
+
+
+@app.post("/places/details:batch", response_model=PlaceDetailsBatchResponse)
+@timed_handler
+async def places_details_batch(
+    request: PlaceDetailsBatchRequest,
+) -> PlaceDetailsBatchResponse | Response:
+    return _fast_or_model(await get_place_details_batch(request))
+
+
+_PLACE_FIELDS = frozenset(get_args(PlaceField))
+
+
+def _parse_fields(value: str | None) -> list[str] | None:
+    """Parse a comma-separated `fields` query parameter."""
+    if value is None:
+        return None
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = sorted(set(fields) - _PLACE_FIELDS)
+    if not fields or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}. "
+            f"Choose from: {', '.join(get_args(PlaceField))}.",
+        )
+    return fields
 
 
 @app.get("/places/{place_id}", response_model=PlaceDetails)
-def places_details(place_id: str) -> PlaceDetails:
-    return get_place_details(place_id)
+@timed_handler
+async def places_details(
+    place_id: str, http_request: Request, fields: str | None = None
+) -> Response:
+    selected = _parse_fields(fields)
+    entry = await get_place_details_entry(place_id, selected)
+    return _cacheable(http_request, entry, details_cache_ttl(), _selected(selected))
 
 
 @app.post("/locations/resolve", response_model=LocationResolveResponse)
-def locations_resolve(request: LocationResolveRequest) -> LocationResolveResponse:
-    return resolve_locations(request)
+@timed_handler
+async def locations_resolve(request: LocationResolveRequest, http_request: Request) -> Response:
+    result = await resolve_locations(request)
+    return _cacheable(http_request, CacheEntry.uncached(result), resolve_cache_ttl())
 
 
-if __name__ == "__main__":
+def _optional_int(value: str | None) -> int | None:
+    return int(value) if value else None
+
+
+def run(argv: list[str] | None = None) -> None:
+    import argparse
+
     import uvicorn
 
-    uvicorn.run("local_places.main:app", host="0.0.0.0", port=8000)
+    parser = argparse.ArgumentParser(description="Run the local_places API server.")
+    parser.add_argument("--host", default=os.getenv("LOCAL_PLACES_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("LOCAL_PLACES_PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("LOCAL_PLACES_WORKERS", "1")),
+        help="Worker processes; each gets its own upstream pool and caches.",
+    )
+    parser.add_argument(
+        "--loop",
+        choices=["auto", "asyncio", "uvloop"],
+        default=os.getenv("LOCAL_PLACES_LOOP", "auto"),
+    )
+    parser.add_argument(
+        "--http",
+        choices=["auto", "h11", "httptools"],
+        default=os.getenv("LOCAL_PLACES_HTTP", "auto"),
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=int(os.getenv("LOCAL_PLACES_BACKLOG", "2048")),
+        help="Maximum number of pending connections.",
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=_optional_int(os.getenv("LOCAL_PLACES_LIMIT_CONCURRENCY")),
+        help="Answer 503 once this many connections/tasks are active.",
+    )
+    parser.add_argument(
+        "--timeout-keep-alive",
+        type=int,
+        default=int(os.getenv("LOCAL_PLACES_TIMEOUT_KEEP_ALIVE", "5")),
+    )
+    args = parser.parse_args(argv)
+
+    uvicorn.run(
+        "local_places.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=args.loop,
+        http=args.http,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency,
+        timeout_keep_alive=args.timeout_keep_alive,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    run()
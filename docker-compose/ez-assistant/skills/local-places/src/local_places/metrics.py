@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from typing import Any, ParamSpec, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_SECONDS = Histogram(
+    "local_places_request_seconds",
+    "End-to-end request latency by route.",
+    ["method", "route"],
+    buckets=_BUCKETS,
+)
+REQUESTS = Counter(
+    "local_places_requests_total",
+    "Requests by route and response status.",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = Gauge(
+    "local_places_requests_in_flight",
+    "Requests currently being handled.",
+)
+STAGE_SECONDS = Histogram(
+    "local_places_stage_seconds",
+    "Time spent per request stage. 'framework' is request time outside the "
+    "route handler, i.e. request validation and response serialization.",
+    ["stage"],
+    buckets=_BUCKETS,
+)
+UPSTREAM_RESPONSES = Counter(
+    "local_places_upstream_responses_total",
+    "Google Places API responses by endpoint and status code.",
+    ["endpoint", "status"],
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "local_places_upstream_in_flight",
+    "Google Places API calls currently in flight.",
+)
+
+# Bound children so the hot path skips the label lookup.
+_STAGES = {
+    name: STAGE_SECONDS.labels(name)
+    for name in ("headers", "upstream", "decode", "parse", "handler", "framework")
+}
+
+_handler_seconds: ContextVar[list[float] | None] = ContextVar(
+    "local_places_handler_seconds", default=None
+)
+
+
+def observe_stage(stage: str, started: float) -> float:
+    """Record the time since ``started`` for ``stage`` and return the current time."""
+    now = time.perf_counter()
+    _STAGES[stage].observe(now - started)
+    return now
+
+
+def observe_upstream(endpoint: str, status: int | str) -> None:
+    UPSTREAM_RESPONSES.labels(endpoint, str(status)).inc()
+
+
+def timed_handler(handler: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Time a route handler so the middleware can split out framework overhead."""
+
+    @functools.wraps(handler)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        started = time.perf_counter()
+        try:
+            return await handler(*args, **kwargs)
+        finally:
+            elapsed = observe_stage("handler", started) - started
+            slot = _handler_seconds.get()
+            if slot is not None:
+                slot[0] += elapsed
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status and in-flight count."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        slot = [0.0]
+        token = _handler_seconds.set(slot)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            _handler_seconds.reset(token)
+            elapsed = time.perf_counter() - started
+            # Label by route template, never the raw path, to bound cardinality.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_SECONDS.labels(method, route).observe(elapsed)
+            REQUESTS.labels(method, route, str(status)).inc()
+            if slot[0]:
+                _STAGES["framework"].observe(max(elapsed - slot[0], 0.0))
+
+
+class StatsCollector(Collector):
+    """Expose cache, coalescing, breaker, rate-limit and prefetch counters at scrape time."""
+
+    def __init__(self, stats: Callable[[], dict[str, Any]]):
+        self._stats = stats
+
+    def collect(self) -> Iterator[CounterMetricFamily | GaugeMetricFamily]:
+        stats = self._stats()
+
+        caches = stats["caches"]
+        for name, help_text in (
+            ("hits", "Fresh cache hits."),
+            ("misses", "Cache misses."),
+            ("stale_hits", "Expired entries served while upstream was unavailable."),
+            ("evictions", "Entries evicted by the LRU policy."),
+        ):
+            family = CounterMetricFamily(f"local_places_cache_{name}", help_text, labels=["cache"])
+            for cache, values in caches.items():
+                family.add_metric([cache], values[name])
+            yield family
+        for name, help_text in (
+            ("entries", "Entries held in memory."),
+            ("size_bytes", "Encoded size of entries held in memory."),
+        ):
+            family = GaugeMetricFamily(f"local_places_cache_{name}", help_text, labels=["cache"])
+            for cache, values in caches.items():
+                family.add_metric([cache], values[name])
+            yield family
+
+        coalescing = stats["coalescing"]
+        yield CounterMetricFamily(
+            "local_places_coalesced_calls",
+            "Lookups that joined an identical in-flight upstream call.",
+            value=coalescing["coalesced"],
+        )
+
+        circuit_open = GaugeMetricFamily(
+            "local_places_circuit_open",
+            "1 while the upstream circuit breaker is open.",
+            labels=["endpoint"],
+        )
+        circuit_rejected = CounterMetricFamily(
+            "local_places_circuit_rejected",
+            "Upstream calls rejected by the open circuit breaker.",
+            labels=["endpoint"],
+        )
+        for endpoint, breaker in stats["circuit_breaker"].items():
+            circuit_open.add_metric([endpoint], 1 if breaker["state"] == "open" else 0)
+            circuit_rejected.add_metric([endpoint], breaker["rejected"])
+        yield circuit_open
+        yield circuit_rejected
+
+        acquired = CounterMetricFamily(
+            "local_places_rate_limit_acquired",
+            "Upstream calls admitted by the client-side rate limiter.",
+            labels=["endpoint"],
+        )
+        rejected = CounterMetricFamily(
+            "local_places_rate_limit_rejected",
+            "Upstream calls rejected by the client-side rate limiter.",
+            labels=["endpoint"],
+        )
+        for endpoint, values in stats["rate_limits"].items():
+            acquired.add_metric([endpoint], values["acquired"])
+            rejected.add_metric([endpoint], values["rejected"])
+        yield acquired
+        yield rejected
+
+        prefetch = stats["prefetch"]
+        for name, help_text in (
+            ("enqueued", "Speculative details fetches queued after a search."),
+            ("fetched", "Speculative details fetches completed."),
+            ("used", "Prefetched details later served to a real lookup."),
+        ):
+            yield CounterMetricFamily(
+                f"local_places_prefetch_{name}", help_text, value=prefetch[name]
+            )
+        dropped = CounterMetricFamily(
+            "local_places_prefetch_dropped",
+            "Speculative fetches dropped before queuing.",
+            labels=["reason"],
+        )
+        dropped.add_metric(["queue_full"], prefetch["dropped_queue_full"])
+        dropped.add_metric(["budget"], prefetch["dropped_budget"])
+        yield dropped
+
+
+_stats_collector: StatsCollector | None = None
+
+
+def register_stats(stats: Callable[[], dict[str, Any]]) -> None:
+    # `python -m local_places.main` imports main twice (as __main__ and by uvicorn),
+    # so a second registration swaps the source instead of duplicating the series.
+    global _stats_collector
+    if _stats_collector is None:
+        _stats_collector = StatsCollector(stats)
+        REGISTRY.register(_stats_collector)
+    else:
+        _stats_collector._stats = stats
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException
+
+from local_places.ratelimit import MinuteCounter
+
+logger = logging.getLogger("local_places.prefetch")
+
+_TRACKED = 4096
+
+
+class Prefetcher:
+    """Bounded queue of speculative fetches drained by a fixed pool of workers.
+
+    Offers beyond the queue size or the per-minute budget are dropped, never
+    awaited, so speculation cannot slow down or outspend real traffic.
+    ``claim`` is called when a real lookup is served from cache; claimed keys
+    over fetched keys is the hit rate.
+    """
+
+    def __init__(self, *, workers: int, queue_size: int, budget_per_minute: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.budget_per_minute = budget_per_minute
+        self.usage = MinuteCounter()
+        self._queue: asyncio.Queue[tuple[str, Callable[[], Awaitable[Any]]]] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._pending: set[str] = set()
+        self._fetched: OrderedDict[str, None] = OrderedDict()
+        self.enqueued = 0
+        self.dropped_full = 0
+        self.dropped_budget = 0
+        self.fetched = 0
+        self.failed = 0
+        self.used = 0
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def start(self) -> None:
+        if self.running or self.workers <= 0:
+            return
+        self._queue = asyncio.Queue(maxsize=max(self.queue_size, 1))
+        self._tasks = [asyncio.create_task(self._work(self._queue)) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def offer(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        if self._queue is None or key in self._pending:
+            return False
+        if self.usage.stats()["current_minute"] >= self.budget_per_minute:
+            self.dropped_budget += 1
+            return False
+        try:
+            self._queue.put_nowait((key, fn))
+        except asyncio.QueueFull:
+            self.dropped_full += 1
+            return False
+        self.usage.add()
+        self._pending.add(key)
+        self.enqueued += 1
+        return True
+
+    def claim(self, key: str) -> None:
+        """Count a cache hit on ``key`` as a successful prediction, once."""
+        if key in self._fetched:
+            del self._fetched[key]
+            self.used += 1
+
+    async def _work(self, queue: asyncio.Queue[tuple[str, Callable[[], Awaitable[Any]]]]) -> None:
+        while True:
+            key, fn = await queue.get()
+            try:
+                await fn()
+            except HTTPException as exc:
+                self.failed += 1
+                logger.debug("Prefetch of %s failed: %s", key, exc.detail)
+            except Exception:
+                self.failed += 1
+                logger.exception("Prefetch of %s failed.", key)
+            else:
+                self.fetched += 1
+                self._fetched[key] = None
+                while len(self._fetched) > _TRACKED:
+                    self._fetched.popitem(last=False)
+            finally:
+                self._pending.discard(key)
+                queue.task_done()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.running,
+            "enqueued": self.enqueued,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "dropped_queue_full": self.dropped_full,
+            "dropped_budget": self.dropped_budget,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "used": self.used,
+            "hit_rate": self.used / self.fetched if self.fetched else None,
+            "budget_used_this_minute": self.usage.stats()["current_minute"],
+        }
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+
+class MinuteCounter:
+    """Per-minute event counts for the last hour."""
+
+    def __init__(self) -> None:
+        self._minutes: deque[list[int]] = deque()
+
+    def add(self, count: int = 1) -> None:
+        minute = int(time.time() // 60)
+        if self._minutes and self._minutes[-1][0] == minute:
+            self._minutes[-1][1] += count
+        else:
+            self._minutes.append([minute, count])
+        while self._minutes and self._minutes[0][0] <= minute - 60:
+            self._minutes.popleft()
+
+    def stats(self) -> dict[str, int]:
+        minute = int(time.time() // 60)
+        counts = {bucket_minute: count for bucket_minute, count in self._minutes}
+        return {
+            "current_minute": counts.get(minute, 0),
+            "previous_minute": counts.get(minute - 1, 0),
+            "last_hour": sum(
+                count for bucket_minute, count in counts.items() if bucket_minute > minute - 60
+            ),
+        }
+
+
+class TokenBucket:
+    """Token bucket that queues callers for up to ``max_wait`` seconds.
+
+    Tokens are reserved up front, so concurrent callers are served in arrival
+    order without a lock. A ``rate_per_minute`` of zero disables the limit but
+    still counts usage.
+    """
+
+    def __init__(self, name: str, *, rate_per_minute: float, burst: float, max_wait: float):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(burst, 1.0)
+        self.max_wait = max_wait
+        self.usage = MinuteCounter()
+        self.acquired = 0
+        self.queued = 0
+        self.rejected = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def retry_after(self) -> float:
+        """Seconds until a token would be available to a new caller."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        return max(1.0 - self._tokens, 0.0) / self.rate
+
+    async def acquire(self) -> bool:
+        if self.rate > 0:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > self.max_wait:
+                self._tokens += 1
+                self.rejected += 1
+                return False
+            if wait:
+                self.queued += 1
+                await asyncio.sleep(wait)
+        self.acquired += 1
+        self.usage.add()
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "usage": self.usage.stats(),
+        }
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger("local_places.recorder")
+
+
+def record_key(method: str, path: str, body: dict[str, Any] | None, field_mask: str) -> str:
+    """Identify an upstream call independently of the base URL it was sent to."""
+    canonical = json.dumps(
+        [method.upper(), path, body, field_mask], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Recorder:
+    """Append upstream request/response pairs to a JSONL file.
+
+    Only the method, path, body and field mask are written for the request,
+    never the API key. The stand-in server in ``scripts/standin.py`` replays
+    the file by ``key``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        field_mask: str,
+        status_code: int,
+        content: bytes,
+    ) -> None:
+        try:
+            response: Any = json.loads(content) if content else None
+        except ValueError:
+            response = content.decode(errors="replace")
+        line = json.dumps(
+            {
+                "key": record_key(method, path, body, field_mask),
+                "method": method.upper(),
+                "path": path,
+                "body": body,
+                "field_mask": field_mask,
+                "status": status_code,
+                "response": response,
+                "recorded_at": time.time(),
+            },
+            separators=(",", ":"),
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+        except OSError as exc:
+            logger.error("Could not record upstream call to %s: %s", self.path, exc)
+            return
+        self.recorded += 1
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException
+
+logger = logging.getLogger("local_places.refresh")
+
+
+class Refresher:
+    """Run cache revalidations in the background, at most one per key at a time.
+
+    Failures are logged and counted but never raised: the entry being
+    revalidated is still fresh, so callers already have an answer.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def schedule(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        if key in self._tasks:
+            return False
+        self.scheduled += 1
+        task = asyncio.get_running_loop().create_task(self._run(key, fn))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return True
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await fn()
+        except HTTPException as exc:
+            self.failed += 1
+            logger.warning("Background refresh of %s failed: %s", key, exc.detail)
+        except Exception:
+            self.failed += 1
+            logger.exception("Background refresh of %s failed.", key)
+        else:
+            self.completed += 1
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+        }
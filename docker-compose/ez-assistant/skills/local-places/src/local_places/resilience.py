@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker over a sliding time window.
+
+    The breaker opens once at least ``min_requests`` calls were made in the
+    last ``window`` seconds and ``failure_ratio`` of them failed. After
+    ``cooldown`` seconds it lets a limited number of probe calls through
+    (half-open); a successful probe closes it again, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_ratio: float,
+        min_requests: int,
+        window: float,
+        cooldown: float,
+        half_open_probes: int = 1,
+    ):
+        self.failure_ratio = failure_ratio
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_count = 0
+        self.rejected = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        return True
+
+    def record_success(self) -> None:
+        if self.state == HALF_OPEN:
+            self.state = CLOSED
+            self._outcomes.clear()
+            return
+        self._record(True)
+
+    def release(self) -> None:
+        """End an allowed call without an outcome, e.g. one that hit a quota limit.
+
+        Only a half-open probe is affected: its slot is freed for the next probe.
+        """
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+        total = len(self._outcomes)
+        if total < self.min_requests:
+            return
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if failures / total >= self.failure_ratio:
+            self._open()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "window_requests": len(self._outcomes),
+            "window_failures": sum(1 for _, ok in self._outcomes if not ok),
+            "opened": self.opened_count,
+            "rejected": self.rejected,
+        }
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_count += 1
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given zero-based retry attempt."""
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from local_places.schemas import LocationResolveResponse
+
+logger = logging.getLogger("local_places.resolver")
+
+_NON_WORD = re.compile(r"[^\w]+")
+_DIGIT = re.compile(r"\d")
+_CANDIDATES = 5
+_MIN_FUZZY_LENGTH = 5
+_SHORT_TOKEN = 3
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_NON_WORD.sub(" ", stripped).split())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def edit_distance(left: str, right: str) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)."""
+    if left == right:
+        return 0
+    previous2: list[int] = []
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, right_char in enumerate(right, start=1):
+            cost = 0 if left_char == right_char else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and left_char == right[j - 2]
+                and left[i - 2] == right_char
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def rigid_tokens(text: str) -> list[str]:
+    """Tokens a fuzzy match must not change: numbers and short codes such as states.
+
+    "123 main st" and "125 main st", or "springfield il" and "springfield ma",
+    are a character apart but name different places.
+    """
+    return sorted(
+        token for token in text.split() if len(token) <= _SHORT_TOKEN or _DIGIT.search(token)
+    )
+
+
+def similarity(left: str, right: str) -> float:
+    longest = max(len(left), len(right))
+    if not longest:
+        return 1.0
+    return 1.0 - edit_distance(left, right) / longest
+
+
+@dataclass
+class _Resolved:
+    response: LocationResolveResponse
+    limit: int
+    learned_at: float
+
+
+class LocalResolver:
+    """Answers location lookups from previously resolved queries.
+
+    Queries are matched on their normalized text (case, accents, punctuation
+    and spacing ignored). Near misses are found through a trigram index and
+    scored by edit-distance similarity; only matches scoring at least
+    ``threshold`` whose numbers and short tokens are identical are answered
+    locally.
+
+    With ``max_age``, entries learned longer ago than that are dropped on
+    lookup, so answers are refetched as often as the resolve cache would.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float,
+        max_entries: int,
+        aliases: dict[str, str],
+        max_age: float | None = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._aliases = {normalize(alias): target for alias, target in aliases.items()}
+        self._entries: OrderedDict[str, _Resolved] = OrderedDict()
+        self._grams: dict[str, set[str]] = {}
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def expand(self, text: str) -> str:
+        """Replace a configured alias such as "home" with its location text."""
+        return self._aliases.get(normalize(text), text)
+
+    def lookup(self, text: str, limit: int) -> tuple[LocationResolveResponse, float] | None:
+        if self.max_entries <= 0:
+            return None
+        key = normalize(text)
+        resolved = self._entries.get(key)
+        if resolved is not None and self._expired(resolved):
+            self._forget(key)
+            resolved = None
+        if resolved is not None and self._covers(resolved, limit):
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return self._sliced(resolved, limit), 1.0
+
+        best: tuple[float, _Resolved] | None = None
+        if len(key) >= _MIN_FUZZY_LENGTH:
+            rigid = rigid_tokens(key)
+            for candidate in self._candidates(key):
+                entry = self._entries[candidate]
+                if self._expired(entry):
+                    self._forget(candidate)
+                    continue
+                if not self._covers(entry, limit) or rigid_tokens(candidate) != rigid:
+                    continue
+                score = similarity(key, candidate)
+                if best is None or score > best[0]:
+                    best = (score, entry)
+        if best is not None and best[0] >= self.threshold:
+            self.fuzzy_hits += 1
+            return self._sliced(best[1], limit), best[0]
+        self.misses += 1
+        return None
+
+    def learn(self, text: str, limit: int, response: LocationResolveResponse) -> None:
+        if self.max_entries <= 0 or not response.results:
+            return
+        key = normalize(text)
+        if key in self._entries:
+            self._forget(key)
+        self._entries[key] = _Resolved(response=response, limit=limit, learned_at=time.time())
+        for gram in _trigrams(key):
+            self._grams.setdefault(gram, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._forget(next(iter(self._entries)))
+
+    def forget(self, text: str) -> None:
+        key = normalize(text)
+        if key in self._entries:
+            self._forget(key)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+        }
+
+    def _candidates(self, key: str) -> list[str]:
+        shared: dict[str, int] = {}
+        for gram in _trigrams(key):
+            for candidate in self._grams.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        return sorted(shared, key=shared.__getitem__, reverse=True)[:_CANDIDATES]
+
+    def _forget(self, key: str) -> None:
+        del self._entries[key]
+        for gram in _trigrams(key):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+    def _expired(self, resolved: _Resolved) -> bool:
+        return self.max_age is not None and resolved.learned_at + self.max_age <= time.time()
+
+    @staticmethod
+    def _covers(resolved: _Resolved, limit: int) -> bool:
+        # A stored answer is complete for `limit` if it was fetched with at least
+        # that limit, or if upstream returned fewer results than were asked for.
+        return resolved.limit >= limit or len(resolved.response.results) < resolved.limit
+
+    @staticmethod
+    def _sliced(resolved: _Resolved, limit: int) -> LocationResolveResponse:
+        if len(resolved.response.results) <= limit:
+            return resolved.response
+        return LocationResolveResponse(results=resolved.response.results[:limit])
+
+
+def load_aliases(path: str | None) -> dict[str, str]:
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as handle:
+            aliases = json.load(handle)
+    except (OSError, ValueError) as exc:
+        logger.error("Could not load resolver aliases from %s: %s", path, exc)
+        return {}
+    return {str(alias): str(target) for alias, target in aliases.items()}
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -52,12 +54,35 @@ class Filters(BaseModel):
         return value
 
 
+PlaceField = Literal[
+    "name",
+    "address",
+    "location",
+    "rating",
+    "price_level",
+    "types",
+    "open_now",
+    "hours",
+    "phone",
+    "website",
+]
+
+
 class SearchRequest(BaseModel):
     query: str = Field(min_length=1)
     location_bias: LocationBias | None = None
     filters: Filters | None = None
     limit: int = Field(default=10, ge=1, le=20)
     page_token: str | None = None
+    include_details: bool = False
+    # Only request and return these fields (plus place_id). Selecting hours, phone
+    # or website returns details-shaped results, like include_details.
+    fields: list[PlaceField] | None = Field(default=None, min_length=1)
+
+
+class SearchStreamRequest(SearchRequest):
+    # Google Text Search returns at most 60 results across all pages.
+    max_results: int = Field(default=60, ge=1, le=60)
 
 
 class PlaceSummary(BaseModel):
@@ -71,11 +96,6 @@ class PlaceSummary(BaseModel):
     open_now: bool | None = None
 
 
-class SearchResponse(BaseModel):
-    results: list[PlaceSummary]
-    next_page_token: str | None = None
-
-
 class LocationResolveRequest(BaseModel):
     location_text: str = Field(min_length=1)
     limit: int = Field(default=5, ge=1, le=10)
@@ -105,3 +125,50 @@ class PlaceDetails(BaseModel):
     website: str | None = None
     hours: list[str] | None = None
     open_now: bool | None = None
+
+
+class SearchResponse(BaseModel):
+    # Results are PlaceDetails when the request sets include_details.
+    results: list[PlaceSummary | PlaceDetails]
+    next_page_token: str | None = None
+
+
+class PlaceDetailsBatchRequest(BaseModel):
+    place_ids: list[str] = Field(min_length=1, max_length=50)
+
+
+class PlaceDetailsError(BaseModel):
+    place_id: str
+    status_code: int
+    detail: str
+
+
+class PlaceDetailsBatchResponse(BaseModel):
+    results: list[PlaceDetails]
+    errors: list[PlaceDetailsError]
+
+
+class NearbyRequest(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+    radius_m: float = Field(gt=0, le=50000)
+    type: str | None = Field(default=None, min_length=1)
+    min_rating: float | None = Field(default=None, ge=0, le=5)
+    limit: int = Field(default=10, ge=1, le=20)
+
+
+class NearbyResponse(BaseModel):
+    results: list[PlaceSummary]
+    source: Literal["local", "upstream"]
+
+
+class SettingsReloadRequest(BaseModel):
+    # Omit to re-read GOOGLE_PLACES_API_KEY_FILE / GOOGLE_PLACES_API_KEY.
+    api_key: str | None = Field(default=None, min_length=1)
+
+
+class SettingsInfo(BaseModel):
+    api_key_set: bool
+    api_key_suffix: str | None = None
+    source: str
+    loaded_at: float
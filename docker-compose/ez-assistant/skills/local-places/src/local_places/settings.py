@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from typing import Any
+
+from fastapi import HTTPException
+
+logger = logging.getLogger("local_places.settings")
+
+_API_KEY_PATTERN = re.compile(r"AIza[0-9A-Za-z_-]{35}")
+
+
+class UpstreamSettings:
+    """Google Places credentials, loaded once and replaced as a whole on reload.
+
+    Request headers are built once per field mask and the same dict is handed
+    to every call, so callers must not mutate it.
+    """
+
+    def __init__(self, api_key: str | None, source: str):
+        self.api_key = api_key or None
+        self.source = source
+        self.loaded_at = time.time()
+        self._headers: dict[str, dict[str, str]] = {}
+
+    @classmethod
+    def load(cls) -> UpstreamSettings:
+        """Read the key from GOOGLE_PLACES_API_KEY_FILE if set, else GOOGLE_PLACES_API_KEY."""
+        path = os.getenv("GOOGLE_PLACES_API_KEY_FILE")
+        if path:
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    return cls(handle.read().strip(), "file")
+            except OSError as exc:
+                logger.error("Could not read GOOGLE_PLACES_API_KEY_FILE %s: %s", path, exc)
+                return cls(None, "file")
+        return cls(os.getenv("GOOGLE_PLACES_API_KEY"), "env")
+
+    def headers(self, field_mask: str) -> dict[str, str]:
+        headers = self._headers.get(field_mask)
+        if headers is None:
+            if self.api_key is None:
+                raise HTTPException(
+                    status_code=500,
+                    detail="GOOGLE_PLACES_API_KEY is not set.",
+                )
+            headers = self._headers[field_mask] = {
+                "Content-Type": "application/json",
+                "X-Goog-Api-Key": self.api_key,
+                "X-Goog-FieldMask": field_mask,
+            }
+        return headers
+
+    def validate(self) -> bool:
+        """Log configuration problems; returns False if upstream calls will fail."""
+        if self.api_key is None:
+            logger.error("GOOGLE_PLACES_API_KEY is not set; Places requests will fail.")
+            return False
+        if not _API_KEY_PATTERN.fullmatch(self.api_key):
+            logger.warning("GOOGLE_PLACES_API_KEY does not look like a Google API key.")
+        return True
+
+    def describe(self) -> dict[str, Any]:
+        # Short test keys would be revealed in full by their suffix.
+        suffix = self.api_key[-4:] if self.api_key and len(self.api_key) > 12 else None
+        return {
+            "api_key_set": self.api_key is not None,
+            "api_key_suffix": suffix,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+        }
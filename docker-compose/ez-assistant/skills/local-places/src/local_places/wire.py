@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+
+class _WireModel(BaseModel):
+    """Google Places API (New) payload shape, limited to the fields we request.
+
+    Bodies are validated straight from the response bytes with
+    ``model_validate_json``, so JSON decoding and parsing happen in a single
+    pass inside pydantic-core without intermediate ``str`` or ``dict`` objects.
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, extra="ignore")
+
+
+class WireLatLng(_WireModel):
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+class WireText(_WireModel):
+    text: str | None = None
+
+
+class WireOpeningHours(_WireModel):
+    open_now: bool | None = None
+    weekday_descriptions: list[str] | None = None
+
+
+class WirePlace(_WireModel):
+    id: str | None = None
+    display_name: WireText | None = None
+    formatted_address: str | None = None
+    location: WireLatLng | None = None
+    rating: float | None = None
+    price_level: str | None = None
+    types: list[str] | None = None
+    current_opening_hours: WireOpeningHours | None = None
+    regular_opening_hours: WireOpeningHours | None = None
+    national_phone_number: str | None = None
+    website_uri: str | None = None
+
+
+class WireSearchResponse(_WireModel):
+    places: list[WirePlace] = []
+    next_page_token: str | None = None
@@ -0,0 +1,50 @@
+import inspect
+import os
+
+os.environ.setdefault("GOOGLE_PLACES_API_KEY", "test-key")
+
+from collections.abc import Awaitable, Callable, Iterator  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from local_places import google_places  # noqa: E402
+from local_places.main import app  # noqa: E402
+
+
+class Upstream:
+    """Stand-in for the Places API: tests set ``handler`` and read ``calls``.
+
+    The handler may be sync or async; an async one can sleep to hold calls in flight.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[httpx.Request] = []
+        self.handler: Callable[
+            [httpx.Request], httpx.Response | Awaitable[httpx.Response]
+        ] = lambda request: httpx.Response(404)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        response = self.handler(request)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+@pytest.fixture
+def upstream(monkeypatch: pytest.MonkeyPatch) -> Upstream:
+    stub = Upstream()
+    monkeypatch.setattr(
+        google_places,
+        "_create_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(stub.handle)),
+    )
+    return stub
+
+
+@pytest.fixture
+def client(upstream: Upstream) -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
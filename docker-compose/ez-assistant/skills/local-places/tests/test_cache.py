@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from local_places.cache import TTLCache, _SQLiteTier
+from local_places.schemas import PlaceDetails
+
+
+def _details(place_id: str) -> PlaceDetails:
+    return PlaceDetails(place_id=place_id, name=f"Place {place_id}")
+
+
+def _cache(path: str, monkeypatch: pytest.MonkeyPatch) -> TTLCache[PlaceDetails]:
+    # A fresh tier per test instead of the process-wide one for this path.
+    tier = _SQLiteTier(path, flush_interval=60)
+    monkeypatch.setattr("local_places.cache._sqlite_tier", lambda _: tier)
+    return TTLCache(
+        "details", PlaceDetails, ttl=60, max_entries=1, max_bytes=1 << 20, db_path=path
+    )
+
+
+def _rows(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+def test_disk_writes_are_batched_off_the_caller(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "cache.db")
+    cache = _cache(path, monkeypatch)
+
+    cache.set("a", _details("a"))
+    cache.set("b", _details("b"))  # evicts "a" from memory
+
+    assert _rows(path) == 0
+    assert cache.get("a") == _details("a")  # read back from the write queue
+
+    cache._disk().flush()
+
+    assert _rows(path) == 2
+
+
+def test_entries_survive_a_restart(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "cache.db")
+    cache = _cache(path, monkeypatch)
+    cache.set("a", _details("a"))
+    cache._disk().flush()
+
+    restarted = _cache(path, monkeypatch)
+
+    assert restarted.get("a") == _details("a")
+
+
+def test_disk_errors_do_not_fail_the_caller(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "cache.db")
+    cache = _cache(path, monkeypatch)
+    disk = cache._disk()
+    disk._conn.execute("DROP TABLE cache_entries")
+
+    cache.set("a", _details("a"))
+    cache.set("b", _details("b"))
+    disk.flush()
+
+    assert disk.write_errors == 1
+    assert cache.get("b") == _details("b")
+    assert cache.get("a") is None
@@ -0,0 +1,39 @@
+import httpx
+
+
+def _echo(request: httpx.Request) -> httpx.Response:
+    place_id = request.url.raw_path.decode().rsplit("/", 1)[-1]
+    if place_id == "boom":
+        raise RuntimeError("upstream handler crashed")
+    return httpx.Response(200, json={"id": place_id})
+
+
+def test_batch_place_ids_stay_one_path_segment(upstream, client) -> None:
+    upstream.handler = _echo
+
+    response = client.post(
+        "/places/details:batch",
+        json={"place_ids": ["batch-ok", "x/../../places:searchText"]},
+    )
+
+    assert response.status_code == 200
+    paths = sorted(call.url.raw_path.decode() for call in upstream.calls)
+    assert paths == [
+        "/v1/places/batch-ok",
+        "/v1/places/x%2F..%2F..%2Fplaces%3AsearchText",
+    ]
+
+
+def test_one_failing_place_id_does_not_fail_the_batch(upstream, client) -> None:
+    upstream.handler = _echo
+
+    response = client.post(
+        "/places/details:batch", json={"place_ids": ["batch-good", "boom"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["place_id"] for result in body["results"]] == ["batch-good"]
+    assert [(error["place_id"], error["status_code"]) for error in body["errors"]] == [
+        ("boom", 500)
+    ]
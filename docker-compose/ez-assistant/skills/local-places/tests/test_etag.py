@@ -0,0 +1,32 @@
+import httpx
+import pytest
+
+
+@pytest.fixture
+def large_place(upstream) -> None:
+    # Large enough to be compressed (LOCAL_PLACES_COMPRESS_MIN_BYTES defaults to 1024).
+    upstream.handler = lambda request: httpx.Response(
+        200,
+        json={
+            "id": "etag-place",
+            "displayName": {"text": "Etag Place"},
+            "formattedAddress": "1 Long Street, " + "x" * 2000,
+        },
+    )
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "identity"])
+def test_etag_is_weak_and_revalidates_for_every_encoding(
+    large_place, client, encoding: str
+) -> None:
+    headers = {"Accept-Encoding": encoding}
+    first = client.get("/places/etag-place", headers=headers)
+    assert first.status_code == 200
+    assert first.headers.get("content-encoding", "identity") == encoding
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    second = client.get("/places/etag-place", headers={**headers, "If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
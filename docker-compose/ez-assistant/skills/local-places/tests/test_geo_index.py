@@ -0,0 +1,50 @@
+import sqlite3
+
+from local_places.geo_index import PlaceIndex, covering_cells
+from local_places.schemas import LatLng, PlaceSummary
+
+_LAT, _LNG = 40.7580, -73.9855
+
+
+def _place(place_id: str) -> PlaceSummary:
+    return PlaceSummary(place_id=place_id, location=LatLng(lat=_LAT, lng=_LNG), types=["cafe"])
+
+
+def _found(index: PlaceIndex) -> list[str]:
+    places = index.nearby(_LAT, _LNG, 100, cells=covering_cells(_LAT, _LNG, 100))
+    return [place.place_id for place in places]
+
+
+def test_file_index_commits_writes_in_the_background(tmp_path) -> None:
+    index = PlaceIndex(str(tmp_path / "geo.db"), flush_interval=60)
+
+    index.add([_place("geo-a")])
+    index.mark_covered(_LAT, _LNG, 500, "cafe", max_age=3600)
+
+    assert _found(index) == []
+    assert not index.is_fresh(_LAT, _LNG, 100, "cafe", max_age=3600)
+
+    index.flush()
+
+    assert _found(index) == ["geo-a"]
+    assert index.is_fresh(_LAT, _LNG, 100, "cafe", max_age=3600)
+
+
+def test_file_index_write_errors_are_logged_not_raised(tmp_path) -> None:
+    path = str(tmp_path / "geo.db")
+    index = PlaceIndex(path, flush_interval=60)
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE places")
+
+    index.add([_place("geo-b")])
+    index.flush()
+
+    assert index.write_errors == 1
+
+
+def test_memory_index_writes_immediately() -> None:
+    index = PlaceIndex(":memory:")
+
+    index.add([_place("geo-c")])
+
+    assert _found(index) == ["geo-c"]
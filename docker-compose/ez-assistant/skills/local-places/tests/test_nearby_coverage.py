@@ -0,0 +1,58 @@
+import math
+
+import httpx
+import pytest
+
+from local_places import google_places
+from local_places.geo_index import PlaceIndex
+
+_LAT, _LNG = 40.7580, -73.9855
+
+
+def _places(count: int, max_offset_m: float) -> list[dict]:
+    step = max_offset_m / max(count - 1, 1) / 111_320.0
+    return [
+        {
+            "id": f"near-{index}",
+            "displayName": {"text": f"Place {index}"},
+            "location": {"latitude": _LAT + index * step, "longitude": _LNG},
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def place_index(monkeypatch: pytest.MonkeyPatch) -> PlaceIndex:
+    index = PlaceIndex(":memory:")
+    monkeypatch.setattr(google_places, "_place_index", index)
+    return index
+
+
+def _nearby(client, lat: float, lng: float, radius_m: float) -> dict:
+    response = client.post(
+        "/places/nearby", json={"lat": lat, "lng": lng, "radius_m": radius_m, "type": "cafe"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_truncated_result_only_covers_out_to_the_farthest_place(client, upstream) -> None:
+    upstream.handler = lambda request: httpx.Response(200, json={"places": _places(20, 200)})
+    assert _nearby(client, _LAT, _LNG, 5000)["source"] == "upstream"
+
+    shifted = _LAT + 1300 / 111_320.0
+    assert _nearby(client, shifted, _LNG, 5000)["source"] == "upstream"
+    assert _nearby(client, _LAT, _LNG, 150)["source"] == "local"
+    assert len(upstream.calls) == 2
+
+
+def test_complete_result_covers_circles_inside_it(client, upstream) -> None:
+    upstream.handler = lambda request: httpx.Response(200, json={"places": _places(5, 200)})
+    assert _nearby(client, _LAT, _LNG, 2000)["source"] == "upstream"
+
+    inside = _LAT + 500 / 111_320.0
+    assert _nearby(client, inside, _LNG, 1000)["source"] == "local"
+    # Same radius but a different center reaches outside the fetched circle.
+    outside_lng = _LNG + 500 / (111_320.0 * math.cos(math.radians(_LAT)))
+    assert _nearby(client, _LAT, outside_lng, 2000)["source"] == "upstream"
+    assert len(upstream.calls) == 2
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from local_places import google_places
+
+
+@pytest.fixture
+def prefetch_enabled(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    """Enable prefetching and record whether each offer ran on the event loop."""
+    monkeypatch.setattr(google_places, "LOCAL_PLACES_PREFETCH_TOP_K", 2)
+    on_loop: list[bool] = []
+    offer = google_places._prefetcher.offer
+
+    def checked_offer(key, fn):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            on_loop.append(False)
+        else:
+            on_loop.append(True)
+        return offer(key, fn)
+
+    monkeypatch.setattr(google_places._prefetcher, "offer", checked_offer)
+    return on_loop
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith(":searchText"):
+        places = [{"id": f"prefetch-{index}", "displayName": {"text": "P"}} for index in range(3)]
+        return httpx.Response(200, json={"places": places})
+    return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+
+def test_prefetch_is_offered_on_the_event_loop(prefetch_enabled, client, upstream) -> None:
+    upstream.handler = _handler
+
+    response = client.post("/places/search", json={"query": "prefetch on loop", "limit": 3})
+
+    assert response.status_code == 200
+    assert prefetch_enabled == [True, True]
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        fetched = {call.url.path.rsplit("/", 1)[-1] for call in upstream.calls[1:]}
+        if fetched == {"prefetch-0", "prefetch-1"}:
+            break
+        time.sleep(0.01)
+    assert fetched == {"prefetch-0", "prefetch-1"}
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import deque
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from local_places import google_places
+from local_places.ratelimit import TokenBucket
+
+_RATE_PER_MINUTE = 300  # 5 per second
+_BURST = 5
+_MAX_WAIT = 0.5
+
+
+class RateLimitedStub:
+    """Upstream that answers 429 once more than ``limit`` calls arrive within ``window`` seconds.
+
+    The limit is what a token bucket with the test's rate and burst can send
+    in one window, so a working limiter never trips it.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.accepted = 0
+        self.rejected = 0
+        self._seen: deque[float] = deque()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        while self._seen and self._seen[0] <= now - self.window:
+            self._seen.popleft()
+        self._seen.append(now)
+        if len(self._seen) > self.limit:
+            self.rejected += 1
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        self.accepted += 1
+        return httpx.Response(200, json={"id": "limited"})
+
+
+@pytest.fixture
+def stub(upstream, monkeypatch: pytest.MonkeyPatch) -> RateLimitedStub:
+    limiter = RateLimitedStub(limit=_BURST + _RATE_PER_MINUTE // 60, window=1.0)
+    upstream.handler = limiter
+    monkeypatch.setattr(google_places, "GOOGLE_PLACES_MAX_RETRIES", 0)
+    return limiter
+
+
+def _install_limiter(monkeypatch: pytest.MonkeyPatch, rate_per_minute: float) -> TokenBucket:
+    bucket = TokenBucket(
+        "details", rate_per_minute=rate_per_minute, burst=_BURST, max_wait=_MAX_WAIT
+    )
+    monkeypatch.setitem(google_places._rate_limiters, "details", bucket)
+    return bucket
+
+
+async def _fire(count: int) -> list[object]:
+    await google_places.open_client()
+    try:
+        url = f"{google_places._PLACE_URL_PREFIX}limited"
+        calls = (
+            google_places._request("GET", url, None, "id", endpoint="details")
+            for _ in range(count)
+        )
+        return await asyncio.gather(*calls, return_exceptions=True)
+    finally:
+        await google_places.close_client()
+
+
+def test_stub_rejects_bursts_when_the_limiter_is_off(stub, monkeypatch) -> None:
+    _install_limiter(monkeypatch, rate_per_minute=0)
+
+    results = asyncio.run(_fire(15))
+
+    assert sorted(result.status_code for result in results) == [200] * 10 + [429] * 5
+    assert stub.rejected == 5
+
+
+def test_limiter_queues_callers_within_max_wait(stub, monkeypatch) -> None:
+    bucket = _install_limiter(monkeypatch, rate_per_minute=_RATE_PER_MINUTE)
+
+    started = time.monotonic()
+    results = asyncio.run(_fire(7))
+    elapsed = time.monotonic() - started
+
+    assert [result.status_code for result in results] == [200] * 7
+    assert stub.rejected == 0
+    # Five calls use the burst, the next two wait 0.2 s and 0.4 s for tokens.
+    assert elapsed >= 0.35
+    assert bucket.stats()["queued"] == 2
+    assert bucket.stats()["acquired"] == 7
+    assert bucket.stats()["rejected"] == 0
+    assert bucket.stats()["usage"]["last_hour"] == 7
+
+
+def test_limiter_rejects_locally_beyond_max_wait(stub, monkeypatch) -> None:
+    bucket = _install_limiter(monkeypatch, rate_per_minute=_RATE_PER_MINUTE)
+
+    results = asyncio.run(_fire(8))
+
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 429
+    assert int(rejected[0].headers["Retry-After"]) >= 1
+    assert stub.accepted == 7
+    assert stub.rejected == 0
+    assert bucket.stats()["rejected"] == 1
+    assert bucket.stats()["usage"]["last_hour"] == 7
+
+
+@pytest.mark.parametrize("place_id", ["abc:def", "x:searchText", "x:searchNearby"])
+def test_place_ids_with_colons_are_billed_to_details(
+    place_id: str, upstream, client, monkeypatch
+) -> None:
+    buckets = {
+        name: TokenBucket(name, rate_per_minute=_RATE_PER_MINUTE, burst=_BURST, max_wait=0)
+        for name in google_places._rate_limiters
+    }
+    for name, bucket in buckets.items():
+        monkeypatch.setitem(google_places._rate_limiters, name, bucket)
+    upstream.handler = lambda request: httpx.Response(200, json={"id": place_id})
+
+    response = client.get(f"/places/{place_id}")
+
+    assert response.status_code == 200
+    assert response.json()["place_id"] == place_id
+    assert {name: bucket.stats()["acquired"] for name, bucket in buckets.items()} == {
+        "searchText": 0,
+        "details": 1,
+        "searchNearby": 0,
+    }
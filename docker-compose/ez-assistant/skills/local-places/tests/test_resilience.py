@@ -0,0 +1,123 @@
+import httpx
+import pytest
+
+from local_places import google_places
+from local_places.ratelimit import TokenBucket
+from local_places.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _breaker(cooldown: float = 60.0) -> CircuitBreaker:
+    return CircuitBreaker(failure_ratio=0.5, min_requests=4, window=30, cooldown=cooldown)
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_requests):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_stays_closed_below_min_requests_and_failure_ratio() -> None:
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    for _ in range(5):
+        breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_failures"] == 4
+
+
+def test_opens_and_rejects_during_cooldown() -> None:
+    breaker = _breaker()
+
+    _trip(breaker)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_admits_one_probe_and_closes_on_success() -> None:
+    breaker = _breaker(cooldown=0)
+    _trip(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens() -> None:
+    breaker = _breaker(cooldown=0)
+    _trip(breaker)
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_released_probe_frees_its_slot() -> None:
+    breaker = _breaker(cooldown=0)
+    _trip(breaker)
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+@pytest.fixture
+def fresh_breakers(monkeypatch: pytest.MonkeyPatch) -> dict[str, CircuitBreaker]:
+    breakers = {name: google_places._circuit_breaker() for name in google_places._breakers}
+    monkeypatch.setattr(google_places, "_breakers", breakers)
+    for name in google_places._rate_limiters:
+        monkeypatch.setitem(
+            google_places._rate_limiters,
+            name,
+            TokenBucket(name, rate_per_minute=0, burst=1, max_wait=0),
+        )
+    monkeypatch.setattr(google_places, "_retry_delay", lambda attempt: 0.0)
+    return breakers
+
+
+def test_retries_count_as_one_failure_per_request(upstream, client, fresh_breakers) -> None:
+    upstream.handler = lambda request: httpx.Response(503)
+
+    for index in range(3):
+        assert client.get(f"/places/breaker-5xx-{index}").status_code == 502
+
+    retries = google_places.GOOGLE_PLACES_MAX_RETRIES
+    assert len(upstream.calls) == 3 * (retries + 1)
+    assert fresh_breakers["details"].stats()["window_failures"] == 3
+    assert fresh_breakers["details"].state == CLOSED
+
+
+def test_quota_429s_do_not_open_the_breaker(upstream, client, fresh_breakers) -> None:
+    upstream.handler = lambda request: httpx.Response(429, headers={"Retry-After": "0"})
+
+    for index in range(12):
+        client.get(f"/places/breaker-429-{index}")
+
+    assert fresh_breakers["details"].state == CLOSED
+    assert fresh_breakers["details"].stats()["window_requests"] == 0
+
+
+def test_an_open_breaker_only_stops_its_own_endpoint(upstream, client, fresh_breakers) -> None:
+    _trip(fresh_breakers["details"])
+    upstream.handler = lambda request: httpx.Response(200, json={"places": []})
+
+    assert client.get("/places/breaker-open").status_code == 503
+    response = client.post("/locations/resolve", json={"location_text": "Breaker Town"})
+
+    assert response.status_code == 200
+    assert [call.url.path for call in upstream.calls] == ["/v1/places:searchText"]
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from local_places import resolver as resolver_module
+from local_places.resolver import LocalResolver
+from local_places.schemas import LocationResolveResponse, ResolvedLocation
+
+
+def _resolver(*queries: str) -> LocalResolver:
+    resolver = LocalResolver(threshold=0.85, max_entries=100, aliases={})
+    for query in queries:
+        resolver.learn(
+            query, 1, LocationResolveResponse(results=[ResolvedLocation(place_id=query)])
+        )
+    return resolver
+
+
+@pytest.mark.parametrize(
+    ("known", "query"),
+    [
+        ("123 Main Street, Boston", "125 Main Street, Boston"),
+        ("Springfield, IL", "Springfield, MA"),
+        ("Portland, OR", "Portland, ME"),
+        ("London, UK", "London, ON"),
+        ("Route 66 Diner", "Route 67 Diner"),
+        ("Apartment 4B, 10 Elm St", "Apartment 4C, 10 Elm St"),
+    ],
+)
+def test_different_places_are_not_fuzzy_hits(known: str, query: str) -> None:
+    resolver = _resolver(known)
+
+    assert resolver.lookup(query, 1) is None
+
+
+@pytest.mark.parametrize(
+    ("known", "query"),
+    [
+        ("New York, NY", "New Yrok, NY"),
+        ("Brooklyn Bridge Park", "Brooklyn Bridge Prak"),
+        ("123 Main Street, Boston", "123 Main Streat, Boston"),
+        ("São Paulo", "sao paulo"),
+    ],
+)
+def test_typos_are_answered_locally(known: str, query: str) -> None:
+    resolver = _resolver(known)
+
+    found = resolver.lookup(query, 1)
+
+    assert found is not None
+    assert found[0].results[0].place_id == known
+
+
+def test_learned_entries_expire_after_max_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    resolver = LocalResolver(threshold=0.85, max_entries=100, aliases={}, max_age=60)
+    now = 1_000_000.0
+    monkeypatch.setattr(resolver_module, "time", SimpleNamespace(time=lambda: now))
+    resolver.learn(
+        "Brooklyn Bridge Park", 1, LocationResolveResponse(results=[ResolvedLocation(place_id="p")])
+    )
+    assert resolver.lookup("Brooklyn Bridge Park", 1) is not None
+
+    now += 61
+
+    assert resolver.lookup("Brooklyn Bridge Prak", 1) is None
+    assert resolver.lookup("Brooklyn Bridge Park", 1) is None
+    assert resolver.stats()["entries"] == 0
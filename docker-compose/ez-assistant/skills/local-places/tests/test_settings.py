@@ -0,0 +1,57 @@
+import pytest
+from fastapi import HTTPException
+
+from local_places import google_places, main
+from local_places.settings import UpstreamSettings
+
+_KEY = "AIza" + "k" * 35
+
+
+@pytest.fixture
+def loaded(monkeypatch: pytest.MonkeyPatch) -> UpstreamSettings:
+    settings = UpstreamSettings(_KEY, "env")
+    monkeypatch.setattr(google_places, "_settings", settings)
+    return settings
+
+
+def test_unreadable_key_file_keeps_the_current_settings(tmp_path, monkeypatch, loaded) -> None:
+    monkeypatch.setenv("GOOGLE_PLACES_API_KEY_FILE", str(tmp_path / "missing"))
+
+    with pytest.raises(HTTPException) as raised:
+        google_places.reload_settings()
+
+    assert raised.value.status_code == 500
+    assert google_places._settings is loaded
+    assert google_places._settings.headers("id")["X-Goog-Api-Key"] == _KEY
+
+
+def test_signal_reload_failure_is_not_raised(tmp_path, monkeypatch, loaded) -> None:
+    monkeypatch.setenv("GOOGLE_PLACES_API_KEY_FILE", str(tmp_path / "missing"))
+
+    main._reload_on_signal()
+
+    assert google_places._settings is loaded
+
+
+def test_admin_reload_reports_the_failure(tmp_path, monkeypatch, loaded, client) -> None:
+    monkeypatch.setattr(main, "LOCAL_PLACES_ADMIN_TOKEN", "admin-token")
+    monkeypatch.setenv("GOOGLE_PLACES_API_KEY_FILE", str(tmp_path / "missing"))
+
+    response = client.post(
+        "/admin/settings:reload", headers={"Authorization": "Bearer admin-token"}
+    )
+
+    assert response.status_code == 500
+    assert "kept the previous settings" in response.json()["detail"]
+    assert google_places._settings is loaded
+
+
+def test_reload_swaps_in_a_readable_key(tmp_path, monkeypatch, loaded) -> None:
+    key_file = tmp_path / "key"
+    key_file.write_text("AIza" + "n" * 35 + "\n", encoding="utf-8")
+    monkeypatch.setenv("GOOGLE_PLACES_API_KEY_FILE", str(key_file))
+
+    info = google_places.reload_settings()
+
+    assert info["source"] == "file"
+    assert google_places._settings.api_key == "AIza" + "n" * 35
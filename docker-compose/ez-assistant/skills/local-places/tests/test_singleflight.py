@@ -0,0 +1,38 @@
+import asyncio
+
+import httpx
+
+from local_places import google_places
+from local_places.main import app
+
+_CONCURRENCY = 100
+
+
+async def _slow_details(request: httpx.Request) -> httpx.Response:
+    # Hold the call open long enough for every request to join it.
+    await asyncio.sleep(0.2)
+    return httpx.Response(200, json={"id": "singleflight-1", "displayName": {"text": "Shared"}})
+
+
+async def _burst(path: str) -> list[httpx.Response]:
+    await google_places.open_client()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get(path) for _ in range(_CONCURRENCY)))
+    finally:
+        await google_places.close_client()
+
+
+def test_concurrent_identical_requests_share_one_upstream_call(upstream) -> None:
+    upstream.handler = _slow_details
+    before = google_places.flight_stats()
+
+    responses = asyncio.run(_burst("/places/singleflight-1"))
+
+    after = google_places.flight_stats()
+    assert [response.status_code for response in responses] == [200] * _CONCURRENCY
+    assert {response.json()["name"] for response in responses} == {"Shared"}
+    assert len(upstream.calls) == 1
+    assert after["upstream_calls"] - before["upstream_calls"] == 1
+    assert after["coalesced"] - before["coalesced"] == _CONCURRENCY - 1
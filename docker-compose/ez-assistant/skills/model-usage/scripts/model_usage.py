@@ -10,70 +10,134 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
+import sqlite3
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, TypeVar
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, concurrent runs may both fetch.
+    fcntl = None  # type: ignore[assignment]
 
-def eprint(msg: str) -> None:
-    print(msg, file=sys.stderr)
-
-
-def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
-    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
-    try:
-        output = subprocess.check_output(cmd, text=True)
-    except FileNotFoundError:
-        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"codexbar cost failed (exit {exc.returncode}).")
-    try:
-        payload = json.loads(output)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
-    if not isinstance(payload, list):
-        raise RuntimeError("Expected codexbar cost JSON array.")
-    return payload
 
+PROVIDERS = ("codex", "claude")
 
-def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
-    if input_path:
-        if input_path == "-":
-            raw = sys.stdin.read()
-        else:
-            with open(input_path, "r", encoding="utf-8") as handle:
-                raw = handle.read()
-        data = json.loads(raw)
-    else:
-        data = run_codexbar_cost(provider)
+CHUNK_SIZE = 1 << 20
 
-    if isinstance(data, dict):
-        return data
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
-    if isinstance(data, list):
-        for entry in data:
-            if isinstance(entry, dict) and entry.get("provider") == provider:
-                return entry
-        raise RuntimeError(f"Provider '{provider}' not found in codexbar payload.")
 
-    raise RuntimeError("Unsupported JSON input format.")
-
-
-@dataclass
-class ModelCost:
-    model: str
-    cost: float
+def eprint(msg: str) -> None:
+    print(msg, file=sys.stderr)
 
 
-def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    daily = payload.get("daily")
-    if not daily:
-        return []
-    if not isinstance(daily, list):
-        return []
-    return [entry for entry in daily if isinstance(entry, dict)]
+class JsonStream:
+    """Walk a JSON document incrementally from a text handle.
+
+    Only the containers the caller walks into are tokenized here; every other
+    value (a daily row, a string, a skipped field) is decoded whole with the
+    stdlib decoder, so memory is bounded by the largest single value rather
+    than the whole document.
+    """
+
+    def __init__(self, handle: TextIO):
+        self._handle = handle
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Read at least as much as is buffered so one huge value is decoded
+        # O(log n) times rather than once per chunk.
+        chunk = self._handle.read(max(CHUNK_SIZE, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Return the next significant character without consuming it ("" at EOF)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number or literal ending the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[None]:
+        """Step through an array; the caller consumes one value per iteration."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def keys(self) -> Iterator[str]:
+        """Step through an object; the caller consumes the value of each key."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def end(self) -> None:
+        if self.peek():
+            raise self._error("Extra data")
 
 
 def parse_date(value: str) -> Optional[date]:
@@ -83,69 +147,541 @@ def parse_date(value: str) -> Optional[date]:
         return None
 
 
-def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+def cutoff_for_days(days: Optional[int]) -> Optional[date]:
     if not days:
-        return entries
-    cutoff = date.today() - timedelta(days=days - 1)
-    filtered: List[Dict[str, Any]] = []
-    for entry in entries:
-        day = entry.get("date")
-        if not isinstance(day, str):
-            continue
-        parsed = parse_date(day)
-        if parsed and parsed >= cutoff:
-            filtered.append(entry)
-    return filtered
+        return None
+    return date.today() - timedelta(days=days - 1)
 
 
-def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
-    totals: Dict[str, float] = {}
-    for entry in entries:
-        breakdowns = entry.get("modelBreakdowns")
-        if not breakdowns:
-            continue
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            model = item.get("modelName")
-            cost = item.get("cost")
-            if not isinstance(model, str):
-                continue
-            if not isinstance(cost, (int, float)):
-                continue
-            totals[model] = totals.get(model, 0.0) + float(cost)
-    return totals
+class UsageAggregator:
+    """Single-pass summary of daily rows in O(models) memory.
 
+    Rows are folded in as they are read: per-model totals, the current-model
+    candidate and each model's latest-day cost are all tracked by date, with
+    later rows winning ties, so row order in the payload does not matter.
+    """
 
-def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
+    def __init__(self, cutoff: Optional[date] = None):
+        self.cutoff = cutoff
+        self.rows = 0
+        self.totals: Dict[str, float] = {}
+        # model -> (date key, day, cost) of the newest row mentioning it.
+        self._latest: Dict[str, Tuple[str, Optional[str], Optional[float]]] = {}
+        self._current: Optional[Tuple[str, str, Optional[str]]] = None
+
+    def add(self, entry: Any) -> None:
+        if not isinstance(entry, dict):
+            return
+        day = entry.get("date")
+        if not isinstance(day, str):
+            day = None
+        if self.cutoff is not None:
+            parsed = parse_date(day) if day else None
+            if not parsed or parsed < self.cutoff:
+                return
+        self.rows += 1
+        key = day or ""
+
+        candidate: Optional[str] = None
+        candidate_cost = 0.0
         breakdowns = entry.get("modelBreakdowns")
-        if isinstance(breakdowns, list) and breakdowns:
-            scored: List[ModelCost] = []
+        if isinstance(breakdowns, list):
+            seen = set()
             for item in breakdowns:
                 if not isinstance(item, dict):
                     continue
                 model = item.get("modelName")
+                if not isinstance(model, str):
+                    continue
                 cost = item.get("cost")
-                if isinstance(model, str) and isinstance(cost, (int, float)):
-                    scored.append(ModelCost(model=model, cost=float(cost)))
-            if scored:
-                scored.sort(key=lambda item: item.cost, reverse=True)
-                return scored[0].model, entry.get("date") if isinstance(entry.get("date"), str) else None
+                if not isinstance(cost, (int, float)):
+                    cost = None
+                else:
+                    cost = float(cost)
+                    self.totals[model] = self.totals.get(model, 0.0) + cost
+                    if candidate is None or cost > candidate_cost:
+                        candidate, candidate_cost = model, cost
+                if model not in seen:
+                    seen.add(model)
+                    latest = self._latest.get(model)
+                    if latest is None or key >= latest[0]:
+                        self._latest[model] = (key, day, cost)
+        if candidate is None:
+            models_used = entry.get("modelsUsed")
+            if isinstance(models_used, list) and models_used and isinstance(models_used[-1], str):
+                candidate = models_used[-1]
+        if candidate is not None and (self._current is None or key >= self._current[0]):
+            self._current = (key, candidate, day)
+
+    def current_model(self) -> Tuple[Optional[str], Optional[str]]:
+        if self._current is None:
+            return None, None
+        return self._current[1], self._current[2]
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        latest = self._latest.get(model)
+        if latest is None:
+            return None, None
+        return latest[1], latest[2]
+
+
+class LedgerBatch:
+    """Dated rows on or after ``since``, summed per day and model for the ledger.
+
+    Only rows newer than what the ledger already holds are kept, so memory is
+    bounded by the days being ingested, not the payload.
+    """
+
+    def __init__(self, since: Optional[str] = None):
+        self.since = since
+        self.costs: Dict[str, Dict[str, Optional[float]]] = {}
+        self.rows: Dict[str, int] = {}
+        self.models_used: Dict[str, str] = {}
+
+    def add(self, entry: Any) -> None:
+        if not isinstance(entry, dict):
+            return
+        day = entry.get("date")
+        # Rows are keyed by date, so undated rows cannot be ledgered.
+        if not isinstance(day, str) or not parse_date(day):
+            return
+        if self.since is not None and day < self.since:
+            return
+        self.rows[day] = self.rows.get(day, 0) + 1
+        costs = self.costs.setdefault(day, {})
+        breakdowns = entry.get("modelBreakdowns")
+        if isinstance(breakdowns, list):
+            for item in breakdowns:
+                if not isinstance(item, dict):
+                    continue
+                model = item.get("modelName")
+                if not isinstance(model, str):
+                    continue
+                cost = item.get("cost")
+                if isinstance(cost, (int, float)):
+                    costs[model] = (costs.get(model) or 0.0) + float(cost)
+                else:
+                    costs.setdefault(model, None)
         models_used = entry.get("modelsUsed")
-        if isinstance(models_used, list) and models_used:
-            last = models_used[-1]
-            if isinstance(last, str):
-                return last, entry.get("date") if isinstance(entry.get("date"), str) else None
-    return None, None
+        if isinstance(models_used, list) and models_used and isinstance(models_used[-1], str):
+            self.models_used[day] = models_used[-1]
+
+
+RowSink = TypeVar("RowSink", UsageAggregator, LedgerBatch)
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_costs (
+    provider TEXT NOT NULL,
+    date TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost REAL,
+    PRIMARY KEY (provider, date, model)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_costs_by_model ON daily_costs (provider, model, date);
+CREATE TABLE IF NOT EXISTS daily_rows (
+    provider TEXT NOT NULL,
+    date TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    last_model_used TEXT,
+    PRIMARY KEY (provider, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS model_totals (
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    total REAL NOT NULL,
+    priced INTEGER NOT NULL,
+    PRIMARY KEY (provider, model)
+) WITHOUT ROWID;
+"""
+
+
+class Ledger:
+    """SQLite store of per-day, per-model costs, keyed by provider/date/model.
+
+    Ingest only replaces days on or after the last ingested date that the new
+    payload contains: the newest day is still accumulating cost, earlier days
+    are final, and days missing from the payload are kept. All-time totals
+    per model are summed again on ingest for the models it touches, so
+    unbounded queries stay O(models) however long the history is.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(LEDGER_SCHEMA)
+
+    def last_date(self, provider: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT MAX(date) FROM daily_rows WHERE provider = ?", (provider,)
+        ).fetchone()
+        return row[0]
+
+    def ingest(self, provider: str, batch: LedgerBatch) -> int:
+        # A batch shared by several providers starts at the earliest of their
+        # last dates; anything before this provider's own is already final.
+        since = self.last_date(provider) or ""
+        days = [day for day in batch.rows if day >= since]
+        with self.conn:
+            # Models whose totals this ingest changes: those in the new days and
+            # those on the days being replaced.
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS ingest_models (model TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM ingest_models")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO ingest_models VALUES (?)",
+                ((model,) for day in days for model in batch.costs[day]),
+            )
+            if since:
+                # Only days present in the batch are replaced; days the payload
+                # no longer has (codexbar logs rotated or pruned) are kept.
+                self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS ingest_days (date TEXT PRIMARY KEY)")
+                self.conn.execute("DELETE FROM ingest_days")
+                self.conn.executemany("INSERT INTO ingest_days VALUES (?)", [(day,) for day in days])
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO ingest_models SELECT model FROM daily_costs"
+                    " WHERE provider = ? AND date IN (SELECT date FROM ingest_days)",
+                    (provider,),
+                )
+                self.conn.execute(
+                    "DELETE FROM daily_costs WHERE provider = ? AND date IN (SELECT date FROM ingest_days)",
+                    (provider,),
+                )
+                self.conn.execute(
+                    "DELETE FROM daily_rows WHERE provider = ? AND date IN (SELECT date FROM ingest_days)",
+                    (provider,),
+                )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO daily_costs VALUES (?, ?, ?, ?)",
+                (
+                    (provider, day, model, cost)
+                    for day in days
+                    for model, cost in batch.costs[day].items()
+                ),
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO daily_rows VALUES (?, ?, ?, ?)",
+                ((provider, day, batch.rows[day], batch.models_used.get(day)) for day in days),
+            )
+            self._update_totals(provider)
+        return len(days)
+
+    def _update_totals(self, provider: str) -> None:
+        # Totals are summed again from daily_costs rather than adjusted by the
+        # replaced and added costs: subtracting and re-adding floats drifts.
+        self.conn.execute(
+            "DELETE FROM model_totals WHERE provider = ? AND model IN (SELECT model FROM ingest_models)",
+            (provider,),
+        )
+        self.conn.execute(
+            "INSERT INTO model_totals SELECT provider, model, COALESCE(SUM(cost), 0), COUNT(cost)"
+            " FROM daily_costs WHERE provider = ? AND model IN (SELECT model FROM ingest_models)"
+            " GROUP BY provider, model",
+            (provider,),
+        )
+
+    def view(self, provider: str, cutoff: Optional[date] = None) -> LedgerView:
+        return LedgerView(self.conn, provider, cutoff.isoformat() if cutoff else "")
+
+
+class LedgerView:
+    """Ledger queries with the same interface as :class:`UsageAggregator`."""
+
+    def __init__(self, conn: sqlite3.Connection, provider: str, since: str):
+        self._conn = conn
+        self._args = (provider, since)
+        self.rows = conn.execute(
+            "SELECT COALESCE(SUM(rows), 0) FROM daily_rows WHERE provider = ? AND date >= ?",
+            self._args,
+        ).fetchone()[0]
+        if since:
+            totals = conn.execute(
+                "SELECT model, SUM(cost) AS total FROM daily_costs"
+                " WHERE provider = ? AND date >= ? AND cost IS NOT NULL"
+                " GROUP BY model ORDER BY total DESC, model",
+                self._args,
+            )
+        else:
+            totals = conn.execute(
+                "SELECT model, total FROM model_totals"
+                " WHERE provider = ? AND priced > 0 ORDER BY total DESC, model",
+                (provider,),
+            )
+        self.totals: Dict[str, float] = dict(totals)
+
+    def current_model(self) -> Tuple[Optional[str], Optional[str]]:
+        scored = self._conn.execute(
+            "SELECT date, model FROM daily_costs WHERE provider = ? AND cost IS NOT NULL AND date = ("
+            "SELECT date FROM daily_costs WHERE provider = ? AND date >= ? AND cost IS NOT NULL"
+            " ORDER BY date DESC LIMIT 1) ORDER BY cost DESC LIMIT 1",
+            (self._args[0], *self._args),
+        ).fetchone()
+        used = self._conn.execute(
+            "SELECT date, last_model_used FROM daily_rows"
+            " WHERE provider = ? AND date >= ? AND last_model_used IS NOT NULL"
+            " ORDER BY date DESC LIMIT 1",
+            self._args,
+        ).fetchone()
+        # modelsUsed is only the fallback for days without scored breakdowns.
+        if used and (not scored or used[0] > scored[0]):
+            return used[1], used[0]
+        if scored:
+            return scored[1], scored[0]
+        return None, None
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        row = self._conn.execute(
+            "SELECT date, cost FROM daily_costs"
+            " WHERE provider = ? AND model = ? AND date >= ?"
+            " ORDER BY date DESC LIMIT 1",
+            (self._args[0], model, self._args[1]),
+        ).fetchone()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
+
+def _aggregate_provider(stream: JsonStream, sink: RowSink) -> Tuple[Any, RowSink]:
+    provider = None
+    for key in stream.keys():
+        if key == "daily" and stream.peek() == "[":
+            for _ in stream.items():
+                sink.add(stream.value())
+        elif key == "provider":
+            provider = stream.value()
+        else:
+            stream.value()
+    return provider, sink
+
+
+def aggregate_stream(
+    handle: TextIO,
+    providers: Sequence[str],
+    new_sink: Callable[[], RowSink],
+    require_array: bool = False,
+) -> Dict[str, RowSink]:
+    """Feed the daily rows of each provider in a codexbar cost payload into a sink.
+
+    Accepts the codexbar array (one object per provider) or a single provider
+    object, which is used as-is when one provider is asked for. The payload is
+    read once, as a stream, however many providers are collected.
+    """
+    stream = JsonStream(handle)
+    first = stream.peek()
+    if first == "{" and not require_array and len(providers) == 1:
+        _, sink = _aggregate_provider(stream, new_sink())
+        stream.end()
+        return {providers[0]: sink}
+    if first == "[":
+        objects = stream.items()
+    elif first == "{" and not require_array:
+        objects = iter([None])
+    elif require_array:
+        raise RuntimeError("Expected codexbar cost JSON array.")
+    else:
+        stream.value()
+        stream.end()
+        raise RuntimeError("Unsupported JSON input format.")
+
+    found: Dict[str, RowSink] = {}
+    for _ in objects:
+        if stream.peek() != "{":
+            stream.value()
+            continue
+        # "provider" may follow "daily", so every object is aggregated and
+        # only the first match kept; memory stays O(models) per object.
+        name, sink = _aggregate_provider(stream, new_sink())
+        if name in providers and name not in found:
+            found[name] = sink
+    stream.end()
+    if len(providers) == 1:
+        if providers[0] not in found:
+            raise RuntimeError(f"Provider '{providers[0]}' not found in codexbar payload.")
+        return found
+    # With several providers a missing one is just empty; report_providers skips it.
+    return {provider: found[provider] if provider in found else new_sink() for provider in providers}
+
+
+class _Tee:
+    """Read-through wrapper that copies everything read from ``handle``."""
+
+    def __init__(self, handle: TextIO, copy: TextIO):
+        self._handle = handle
+        self._copy = copy
+
+    def read(self, size: int = -1) -> str:
+        data = self._handle.read(size)
+        self._copy.write(data)
+        return data
+
+
+def run_codexbar_cost(
+    provider: str, new_sink: Callable[[], RowSink], copy_to: Optional[TextIO] = None
+) -> RowSink:
+    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
+    failure: Optional[Exception] = None
+    with proc:
+        assert proc.stdout is not None
+        stdout: Any = proc.stdout if copy_to is None else _Tee(proc.stdout, copy_to)
+        try:
+            sink = aggregate_stream(stdout, [provider], new_sink, require_array=True)[provider]
+        except (ValueError, RuntimeError) as exc:
+            failure = exc
+            # Drain the pipe so a failing codexbar reports its exit status.
+            while proc.stdout.read(CHUNK_SIZE):
+                pass
+    if proc.returncode:
+        raise RuntimeError(f"codexbar cost failed (exit {proc.returncode}).")
+    if isinstance(failure, json.JSONDecodeError):
+        raise RuntimeError(f"Failed to parse codexbar JSON output: {failure}")
+    if failure is not None:
+        raise failure
+    return sink
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "model-usage")
+
+
+class CodexbarCache:
+    """On-disk copy of ``codexbar cost`` output per provider.
+
+    Copies younger than ``max_age`` seconds are read instead of running
+    codexbar. Fetches happen under an exclusive per-provider lock, so
+    concurrent invocations wait for a single codexbar run and then read its
+    output. Copies are written to a temp file and renamed into place, so
+    readers never see a partial file and need no lock.
+    """
+
+    def __init__(self, directory: str, max_age: float):
+        self.directory = directory
+        self.max_age = max_age
+
+    def path(self, provider: str) -> str:
+        return os.path.join(self.directory, f"codexbar-cost-{provider}.json")
+
+    def read(self, provider: str, new_sink: Callable[[], RowSink], refresh: bool = False) -> RowSink:
+        path = self.path(provider)
+        if not refresh:
+            sink = self._read_copy(path, provider, new_sink)
+            if sink is not None:
+                return sink
+        requested = time.time()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Whoever held the lock may have just fetched what we are after;
+            # a refresh only accepts a copy written after it was requested.
+            sink = self._read_copy(path, provider, new_sink, requested if refresh else None)
+            if sink is not None:
+                return sink
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".codexbar-cost-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as copy:
+                    sink = run_codexbar_cost(provider, new_sink, copy_to=copy)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            return sink
+
+    def _read_copy(
+        self,
+        path: str,
+        provider: str,
+        new_sink: Callable[[], RowSink],
+        written_after: Optional[float] = None,
+    ) -> Optional[RowSink]:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if written_after is not None:
+            if mtime < written_after:
+                return None
+        elif time.time() - mtime > self.max_age:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return aggregate_stream(handle, [provider], new_sink, require_array=True)[provider]
+        except (OSError, ValueError, RuntimeError):
+            # An unreadable copy is refetched; real errors resurface from codexbar.
+            return None
+
+
+def read_payloads(
+    input_path: Optional[str],
+    providers: Sequence[str],
+    new_sink: Callable[[], RowSink],
+    cache: Optional[CodexbarCache] = None,
+    refresh: bool = False,
+) -> Dict[str, RowSink]:
+    """Collect each provider's rows; codexbar runs for several providers in parallel."""
+    if input_path == "-":
+        return aggregate_stream(sys.stdin, providers, new_sink)
+    if input_path:
+        with open(input_path, "r", encoding="utf-8") as handle:
+            return aggregate_stream(handle, providers, new_sink)
+
+    def fetch(provider: str) -> RowSink:
+        if cache is not None:
+            return cache.read(provider, new_sink, refresh=refresh)
+        return run_codexbar_cost(provider, new_sink)
+
+    if len(providers) == 1:
+        return {providers[0]: fetch(providers[0])}
+    with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+        futures = {provider: pool.submit(fetch, provider) for provider in providers}
+        results: Dict[str, RowSink] = {}
+        failures: Dict[str, Exception] = {}
+        for provider, future in futures.items():
+            try:
+                results[provider] = future.result()
+            except Exception as exc:
+                failures[provider] = exc
+                results[provider] = new_sink()
+    if len(failures) == len(providers):
+        raise next(iter(failures.values()))
+    # One failing provider leaves the others' results; report_providers skips it.
+    for provider, exc in failures.items():
+        eprint(f"{provider}: {exc}")
+    return results
+
+
+def load_usage(
+    input_path: Optional[str],
+    providers: Sequence[str],
+    days: Optional[int],
+    cache: Optional[CodexbarCache] = None,
+    refresh: bool = False,
+) -> Dict[str, UsageAggregator]:
+    new_sink = partial(UsageAggregator, cutoff_for_days(days))
+    return read_payloads(input_path, providers, new_sink, cache, refresh)
+
+
+def load_ledger_usage(
+    ledger_path: str,
+    input_path: Optional[str],
+    providers: Sequence[str],
+    days: Optional[int],
+    ingest: bool = True,
+    cache: Optional[CodexbarCache] = None,
+    refresh: bool = False,
+) -> Dict[str, LedgerView]:
+    ledger = Ledger(ledger_path)
+    if ingest:
+        last_dates = [ledger.last_date(provider) for provider in providers]
+        since = None if None in last_dates else min(last_dates)
+        batches = read_payloads(input_path, providers, partial(LedgerBatch, since), cache, refresh)
+        for provider, batch in batches.items():
+            ledger.ingest(provider, batch)
+    cutoff = cutoff_for_days(days)
+    return {provider: ledger.view(provider, cutoff) for provider in providers}
 
 
 def usd(value: Optional[float]) -> str:
@@ -154,27 +690,6 @@ def usd(value: Optional[float]) -> str:
     return f"${value:,.2f}"
 
 
-def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional[str], Optional[float]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            if item.get("modelName") == model:
-                cost = item.get("cost") if isinstance(item.get("cost"), (int, float)) else None
-                day = entry.get("date") if isinstance(entry.get("date"), str) else None
-                return day, float(cost) if cost is not None else None
-    return None, None
-
-
 def render_text_current(
     provider: str,
     model: str,
@@ -233,76 +748,167 @@ def build_json_all(provider: str, totals: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
+def current_fields(provider: str, usage: Any, model: Optional[str]) -> Optional[Dict[str, Any]]:
+    latest_date = None
+    if not model:
+        model, latest_date = usage.current_model()
+    if not model:
+        return None
+    latest_cost_date, latest_cost = usage.latest_day_cost(model)
+    return {
+        "provider": provider,
+        "model": model,
+        "latest_date": latest_date,
+        "total_cost": usage.totals.get(model),
+        "latest_cost": latest_cost,
+        "latest_cost_date": latest_cost_date,
+        "entry_count": usage.rows,
+    }
+
+
+def parse_providers(value: str) -> List[str]:
+    if value == "all":
+        return list(PROVIDERS)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROVIDERS]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid provider {', '.join(unknown) or repr(value)} (choose from {', '.join(PROVIDERS)}, all)"
+        )
+    return list(dict.fromkeys(names))
+
+
+def print_json(payload: Dict[str, Any], pretty: bool) -> None:
+    indent = 2 if pretty else None
+    print(json.dumps(payload, indent=indent, sort_keys=pretty))
+
+
+def report_providers(providers: List[str], usages: Dict[str, Any], args: argparse.Namespace) -> int:
+    """Merged report: one section per provider with data, then the grand total."""
+    reports: List[Dict[str, Any]] = []
+    sections: List[str] = []
+    grand_total = 0.0
+    for provider in providers:
+        usage = usages[provider]
+        if args.mode == "current":
+            fields = current_fields(provider, usage, args.model)
+            if fields is None:
+                eprint(f"No model data found for {provider} in codexbar cost payload.")
+                continue
+            grand_total += fields["total_cost"] or 0.0
+            reports.append(build_json_current(**fields))
+            sections.append(render_text_current(**fields))
+        else:
+            if not usage.totals:
+                eprint(f"No model breakdowns found for {provider} in codexbar cost payload.")
+                continue
+            provider_total = sum(usage.totals.values())
+            grand_total += provider_total
+            reports.append({**build_json_all(provider, usage.totals), "totalCostUSD": provider_total})
+            sections.append(
+                f"{render_text_all(provider, usage.totals)}\nProvider total: {usd(provider_total)}"
+            )
+    if not reports:
+        return 2
+
+    if args.format == "json":
+        print_json(
+            {"mode": args.mode, "providers": reports, "totalCostUSD": grand_total}, args.pretty
+        )
+    else:
+        label = "current models" if args.mode == "current" else "all models"
+        sections.append(f"Grand total ({label}): {usd(grand_total)}")
+        print("\n\n".join(sections))
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Summarize CodexBar model usage from local cost logs.")
-    parser.add_argument("--provider", choices=["codex", "claude"], default="codex")
+    parser.add_argument(
+        "--provider",
+        type=parse_providers,
+        default="codex",
+        help="codex, claude, a comma-separated list, or all (default codex).",
+    )
     parser.add_argument("--mode", choices=["current", "all"], default="current")
     parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
     parser.add_argument("--input", help="Path to codexbar cost JSON (or '-' for stdin).")
     parser.add_argument("--days", type=int, help="Limit to last N days (based on daily rows).")
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument(
+        "--ledger",
+        default=os.environ.get("MODEL_USAGE_LEDGER"),
+        help="SQLite ledger to ingest new daily rows into and answer from (env MODEL_USAGE_LEDGER).",
+    )
+    parser.add_argument(
+        "--no-ingest",
+        action="store_true",
+        help="Answer from the ledger without reading codexbar or --input.",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=float(os.environ.get("MODEL_USAGE_CACHE_MAX_AGE", "300")),
+        help="Reuse cached codexbar output up to this many seconds old; 0 disables (default 300).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("MODEL_USAGE_CACHE_DIR") or default_cache_dir(),
+        help="Where cached codexbar output is kept (env MODEL_USAGE_CACHE_DIR).",
+    )
+    parser.add_argument("--refresh", action="store_true", help="Run codexbar even if a cached copy is fresh.")
 
     args = parser.parse_args()
 
+    if args.no_ingest and not args.ledger:
+        eprint("--no-ingest requires --ledger (or MODEL_USAGE_LEDGER).")
+        return 1
+
+    providers: List[str] = args.provider
+    cache = CodexbarCache(args.cache_dir, args.max_age) if args.max_age > 0 else None
     try:
-        payload = load_payload(args.input, args.provider)
+        if args.ledger:
+            usages: Dict[str, Any] = load_ledger_usage(
+                args.ledger,
+                args.input,
+                providers,
+                args.days,
+                ingest=not args.no_ingest,
+                cache=cache,
+                refresh=args.refresh,
+            )
+        else:
+            usages = load_usage(args.input, providers, args.days, cache, args.refresh)
     except Exception as exc:
         eprint(str(exc))
         return 1
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
+    if len(providers) > 1:
+        return report_providers(providers, usages, args)
 
+    provider = providers[0]
+    usage = usages[provider]
     if args.mode == "current":
-        model = args.model
-        latest_date = None
-        if not model:
-            model, latest_date = pick_current_model(entries)
-        if not model:
+        fields = current_fields(provider, usage, args.model)
+        if fields is None:
             eprint("No model data found in codexbar cost payload.")
             return 2
-        totals = aggregate_costs(entries)
-        total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
-
         if args.format == "json":
-            payload_out = build_json_current(
-                provider=args.provider,
-                model=model,
-                latest_date=latest_date,
-                total_cost=total_cost,
-                latest_cost=latest_cost,
-                latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
-            )
-            indent = 2 if args.pretty else None
-            print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+            print_json(build_json_current(**fields), args.pretty)
         else:
-            print(
-                render_text_current(
-                    provider=args.provider,
-                    model=model,
-                    latest_date=latest_date,
-                    total_cost=total_cost,
-                    latest_cost=latest_cost,
-                    latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
-                )
-            )
+            print(render_text_current(**fields))
         return 0
 
-    totals = aggregate_costs(entries)
+    totals = usage.totals
     if not totals:
         eprint("No model breakdowns found in codexbar cost payload.")
         return 2
 
     if args.format == "json":
-        payload_out = build_json_all(provider=args.provider, totals=totals)
-        indent = 2 if args.pretty else None
-        print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+        print_json(build_json_all(provider=provider, totals=totals), args.pretty)
     else:
-        print(render_text_all(provider=args.provider, totals=totals))
+        print(render_text_all(provider=provider, totals=totals))
     return 0
 
 
@@ -0,0 +1,59 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "model_usage.py"
+_spec = importlib.util.spec_from_file_location("model_usage", _SCRIPT)
+model_usage = importlib.util.module_from_spec(_spec)
+sys.modules["model_usage"] = model_usage
+_spec.loader.exec_module(model_usage)
+
+
+def _payload(path: Path, days: dict) -> str:
+    daily = [
+        {"date": day, "modelBreakdowns": [{"modelName": "gpt-5", "cost": cost}]}
+        for day, cost in days.items()
+    ]
+    path.write_text(json.dumps([{"provider": "codex", "daily": daily}]), encoding="utf-8")
+    return str(path)
+
+
+def _ingest(ledger: str, payload: str) -> model_usage.LedgerView:
+    return model_usage.load_ledger_usage(ledger, payload, ["codex"], None)["codex"]
+
+
+def test_shrinking_payload_keeps_history(tmp_path):
+    ledger = str(tmp_path / "ledger.db")
+    _ingest(ledger, _payload(tmp_path / "p1.json", {"2026-10-01": 5.0, "2026-10-02": 7.0}))
+
+    view = _ingest(ledger, _payload(tmp_path / "p2.json", {"2026-10-05": 1.0}))
+
+    assert view.totals == {"gpt-5": 13.0}
+    assert view.rows == 3
+    assert view.latest_day_cost("gpt-5") == ("2026-10-05", 1.0)
+
+
+def test_reingest_replaces_the_last_day(tmp_path):
+    ledger = str(tmp_path / "ledger.db")
+    _ingest(ledger, _payload(tmp_path / "p1.json", {"2026-10-01": 5.0, "2026-10-02": 7.0}))
+
+    view = _ingest(ledger, _payload(tmp_path / "p2.json", {"2026-10-02": 9.0, "2026-10-03": 2.0}))
+
+    assert view.totals == {"gpt-5": 16.0}
+    assert view.rows == 3
+    assert view.latest_day_cost("gpt-5") == ("2026-10-03", 2.0)
+
+
+def test_reingest_totals_do_not_drift(tmp_path):
+    ledger = str(tmp_path / "ledger.db")
+    days = {"2026-10-01": 0.1, "2026-10-02": 0.2}
+    _ingest(ledger, _payload(tmp_path / "p1.json", {**days, "2026-10-03": 0.3}))
+
+    # Replacing the last day must give the total of a fresh ingest, not the old
+    # total with 0.3 subtracted (0.3000000000000001).
+    view = _ingest(ledger, _payload(tmp_path / "p2.json", {"2026-10-03": 0.0}))
+    fresh_payload = _payload(tmp_path / "p3.json", {**days, "2026-10-03": 0.0})
+    fresh = _ingest(str(tmp_path / "fresh.db"), fresh_payload)
+
+    assert view.totals == fresh.totals == {"gpt-5": 0.1 + 0.2}
@@ -0,0 +1,67 @@
+import json
+import sys
+
+import pytest
+
+from test_ledger import model_usage
+
+
+def _run(monkeypatch, capsys, *argv: str):
+    monkeypatch.setattr(sys, "argv", ["model_usage.py", *argv])
+    code = model_usage.main()
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+
+def _codex_only(tmp_path) -> str:
+    path = tmp_path / "codex.json"
+    daily = [{"date": "2026-10-01", "modelBreakdowns": [{"modelName": "gpt-5", "cost": 4.0}]}]
+    path.write_text(json.dumps([{"provider": "codex", "daily": daily}]), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("ledger", [False, True])
+def test_all_providers_skips_one_missing_from_the_payload(tmp_path, monkeypatch, capsys, ledger):
+    argv = ["--provider", "all", "--mode", "all", "--format", "json", "--input", _codex_only(tmp_path)]
+    if ledger:
+        argv += ["--ledger", str(tmp_path / "ledger.db")]
+
+    code, out, err = _run(monkeypatch, capsys, *argv)
+
+    assert code == 0
+    report = json.loads(out)
+    assert [provider["provider"] for provider in report["providers"]] == ["codex"]
+    assert report["totalCostUSD"] == 4.0
+    assert "claude" in err
+
+
+def test_single_missing_provider_still_fails(tmp_path, monkeypatch, capsys):
+    code, _, err = _run(monkeypatch, capsys, "--provider", "claude", "--input", _codex_only(tmp_path))
+
+    assert code == 1
+    assert "Provider 'claude' not found" in err
+
+
+def test_failed_codexbar_run_keeps_other_providers(monkeypatch, capsys):
+    def fake_run(provider, new_sink, copy_to=None):
+        if provider == "claude":
+            raise RuntimeError("codexbar cost failed")
+        sink = new_sink()
+        sink.add({"date": "2026-10-01", "modelBreakdowns": [{"modelName": "gpt-5", "cost": 2.5}]})
+        return sink
+
+    monkeypatch.setattr(model_usage, "run_codexbar_cost", fake_run)
+    usages = model_usage.load_usage(None, ["codex", "claude"], None)
+
+    assert usages["codex"].totals == {"gpt-5": 2.5}
+    assert usages["claude"].totals == {}
+    assert "claude: codexbar cost failed" in capsys.readouterr().err
+
+
+def test_every_codexbar_run_failing_is_an_error(monkeypatch):
+    def fake_run(provider, new_sink, copy_to=None):
+        raise RuntimeError("codexbar not found on PATH.")
+
+    monkeypatch.setattr(model_usage, "run_codexbar_cost", fake_run)
+    with pytest.raises(RuntimeError, match="not found"):
+        model_usage.load_usage(None, ["codex", "claude"], None)